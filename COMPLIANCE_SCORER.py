@@ -18,6 +18,8 @@ IT DOES:
 - Score COMPLETENESS (not approval)
 """
 
+import numpy as np
+
 class HPDComplianceScorer:
     """
     Scores how COMPLETE a document package is
@@ -54,44 +56,55 @@ class HPDComplianceScorer:
                 ]
             }
         }
+        
+        # Flattened once into parallel arrays (one slot per requirement item)
+        self._categories = list(self.requirements)
+        items = [
+            (category_id, item)
+            for category_id, data in enumerate(self.requirements.values())
+            for item in data["items"]
+        ]
+        self._names = [item["name"] for _, item in items]
+        self._rules = [item["rule"] for _, item in items]
+        self._points = np.array([item["points"] for _, item in items], dtype=np.int32)
+        self._category_ids = np.array([category_id for category_id, _ in items], dtype=np.int32)
+        # Fixed per scorer - only the earned side depends on the documents
+        self._total_possible = int(self._points.sum())
+        self._category_possible = np.bincount(self._category_ids, weights=self._points, minlength=len(self._categories))
     
     def score_completeness(self, documents: list) -> dict:
         """
         Returns COMPLETENESS score (0-100)
         NOT approval probability
         """
-        score_details = []
-        total_possible = 0
-        total_earned = 0
+        # Check if each document exists (lowercased once, newline-separated so
+        # a name can never match across two filenames)
+        blob = "\n".join(doc.lower() for doc in documents)
+        present = np.array(
+            [self._document_exists(name, blob) for name in self._names],
+            dtype=np.bool_
+        )
+        earned_points = self._points * present
+        total_earned = int(earned_points.sum())
+        total_possible = self._total_possible
         
-        for category, data in self.requirements.items():
-            category_possible = 0
-            category_earned = 0
-            
-            for item in data["items"]:
-                total_possible += item["points"]
-                category_possible += item["points"]
-                
-                # Check if document exists
-                if self._document_exists(item["name"], documents):
-                    total_earned += item["points"]
-                    category_earned += item["points"]
-                    score_details.append({
-                        "item": item["name"],
-                        "status": "PRESENT",
-                        "points": item["points"],
-                        "rule": item["rule"]
-                    })
-                else:
-                    score_details.append({
-                        "item": item["name"],
-                        "status": "MISSING",
-                        "points": 0,
-                        "rule": item["rule"]
-                    })
-            
-            # Category score
-            category_score = (category_earned / category_possible * 100) if category_possible > 0 else 0
+        # Category scores
+        n_categories = len(self._categories)
+        category_earned = np.bincount(self._category_ids, weights=earned_points, minlength=n_categories)
+        category_scores = {
+            category: round(float(earned / possible * 100), 1) if possible > 0 else 0
+            for category, earned, possible in zip(self._categories, category_earned, self._category_possible)
+        }
+        
+        score_details = [
+            {
+                "item": name,
+                "status": "PRESENT" if found else "MISSING",
+                "points": int(points),
+                "rule": rule
+            }
+            for name, rule, points, found in zip(self._names, self._rules, earned_points, present)
+        ]
         
         # FINAL SCORE - COMPLETENESS ONLY
         completeness_score = (total_earned / total_possible * 100) if total_possible > 0 else 0
@@ -99,15 +112,16 @@ class HPDComplianceScorer:
         return {
             "completeness_score": round(completeness_score, 1),  # NOT approval probability
             "category_breakdown": score_details,
+            "category_scores": category_scores,
             "missing_items": [item for item in score_details if item["status"] == "MISSING"],
             "legal_disclaimer": "This score reflects DOCUMENT COMPLETENESS only. It does not predict or guarantee HPD approval.",
             "public_citations": ["HPD Succession Procedures 2024", "NYC Housing Maintenance Code"]
         }
     
-    def _document_exists(self, doc_name: str, documents: list) -> bool:
+    def _document_exists(self, doc_name: str, blob: str) -> bool:
         """Simple check - in reality, would use your vision system"""
         # This is where your MitchyVision would integrate
-        return any(doc_name in doc.lower() for doc in documents)
+        return doc_name in blob
 
 # ==================== SAFE REPORT GENERATOR ====================
 class SafeReportGenerator:
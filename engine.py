@@ -9,8 +9,125 @@ import re
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterable, Iterator
+from collections import OrderedDict
 import hashlib
+import calendar
+import mmap
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+
+import numpy as np
+
+# Optional readers/accelerators - imported once here, checked for None at use
+try:
+    import hyperscan  # Optional: single-pass SIMD date scanning
+except ImportError:
+    hyperscan = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    from pdfminer.high_level import extract_text as pdfminer_extract_text  # PDF fallback
+except ImportError:
+    pdfminer_extract_text = None
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:
+    pytesseract = None
+
+try:
+    import docx
+except ImportError:
+    docx = None
+
+# Extracted-text cache, keyed by a hash of the file bytes (OCR/PDF parsing is the slow step)
+# Holds CLIENT DOCUMENT TEXT - owner-only on disk; MITCHY_TEXT_CACHE=0 keeps it in memory only
+TEXT_CACHE_DIR = Path.home() / ".cache" / "mitchy"
+TEXT_CACHE_PERSIST = os.getenv("MITCHY_TEXT_CACHE", "1") != "0"
+TEXT_MEMO_SIZE = 256  # Extracted texts kept in memory per analyzer
+
+# Every date format found by the 'date' patterns, in one alternation.
+# The outer group names the format; inner groups are <format>_<part>
+DATE_RE = re.compile(
+    r'(?P<mdy>(?P<mdy_m>\d{1,2})/(?P<mdy_d>\d{1,2})/(?P<mdy_y>\d{4}))'                          # MM/DD/YYYY
+    r'|(?P<ymd>(?P<ymd_y>\d{4})-(?P<ymd_m>\d{1,2})-(?P<ymd_d>\d{1,2}))'                         # YYYY-MM-DD
+    r'|(?P<dash>(?P<dash_a>\d{1,2})-(?P<dash_b>\d{1,2})-(?P<dash_y>\d{4}))'                     # DD-MM-YYYY / MM-DD-YYYY
+    r'|(?P<named>(?P<named_mon>[a-z]{3})[a-z]* (?P<named_d>\d{1,2}),? (?P<named_y>\d{4}))'       # Month DD, YYYY
+    r'|(?P<dnamed>(?P<dnamed_d>\d{1,2}) (?P<dnamed_mon>[a-z]{3})[a-z]* (?P<dnamed_y>\d{4}))',   # DD Month YYYY
+    re.IGNORECASE
+)
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_abbr) if name}
+
+# .txt files at least this big are memory-mapped and scanned as bytes
+MMAP_MIN_BYTES = 1 << 20
+
+def _bytes_pattern(pattern: str) -> Optional[re.Pattern]:
+    """
+    IGNORECASE bytes twin of a lowercased str pattern, for scanning mapped files
+    Bytes IGNORECASE only folds ASCII, so cased non-ASCII letters ('ó') are spelled
+    out as (?:ó|Ó). None where that rewrite isn't exact (inside [...], escaped, or
+    a multi-char case mapping like 'ß') - large .txt files are then decoded instead
+    """
+    out = []
+    in_class = escaped = False
+    for ch in pattern:
+        literal = not escaped
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif in_class:
+            in_class = ch != ']'
+        elif ch == '[':
+            in_class = True
+        if ord(ch) > 127 and ch.lower() != ch.upper():
+            variants = dict.fromkeys((ch, ch.upper(), ch.title()))
+            if in_class or not literal or any(len(v) != 1 for v in variants):
+                return None
+            out.append("(?:" + "|".join(variants) + ")")
+        else:
+            out.append(ch)
+    return re.compile("".join(out).encode('utf-8'), re.IGNORECASE)
+
+# Folders below both limits are analyzed in-process - pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 8
+PARALLEL_MIN_BYTES = 4 << 20
+
+SUPPORTED_SUFFIXES = {'.pdf', '.jpg', '.jpeg', '.png', '.txt', '.doc', '.docx'}
+
+def _iter_files(root: str):
+    """
+    Yield supported files under root (os.scandir walk - filters on the name
+    before building a Path, and reuses DirEntry's cached type info)
+    """
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:  # Unreadable dir, or root is a file - skipped, as rglob did
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in SUPPORTED_SUFFIXES and entry.is_file():
+                    yield Path(entry.path)
+
+def _file_size(path: Path) -> int:
+    """Size in bytes, 0 if the file vanished or can't be stat'ed since the walk"""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
 
 # ==================== INTERNAL ANALYSIS ENGINE ====================
 class MitchyVisionPro:
@@ -19,7 +136,7 @@ class MitchyVisionPro:
     Scans documents to flag potential HPD compliance issues
     """
     
-    def __init__(self):
+    def __init__(self, persist_text: Optional[bool] = None):
         self.patterns = {
             # Foreign Account Detection
             'foreign_account': [
@@ -71,38 +188,155 @@ class MitchyVisionPro:
             'utility_gap_days': 60,
             'residency_years': 2
         }
+        
+        # In-process LRU view of the text cache (content hash -> extracted text)
+        self._text_cache = OrderedDict()
+        self.persist_text = TEXT_CACHE_PERSIST if persist_text is None else persist_text
+    
+    # ---- Compiled patterns: built lazily on first use, then reused ----
+    
+    @cached_property
+    def compiled_patterns(self) -> Dict:
+        """
+        self.patterns compiled once. _extract_text always returns lowercased text,
+        so patterns are lowercased here instead of paying for re.IGNORECASE on
+        every scan (safe: the patterns use no uppercase escapes)
+        """
+        compiled = {}
+        for category, patterns in self.patterns.items():
+            if category == 'document_type':
+                compiled[category] = {
+                    doc_type: [re.compile(p.lower()) for p in doc_patterns]
+                    for doc_type, doc_patterns in patterns.items()
+                }
+            else:
+                compiled[category] = [re.compile(p.lower()) for p in patterns]
+        return compiled
+    
+    @cached_property
+    def category_regex(self) -> Dict:
+        """
+        Red-flag categories fused into one alternation each (group gN = patterns[N])
+        so a file's text is traversed at most once per category
+        """
+        return {
+            category: re.compile(
+                "|".join(f"(?P<g{i}>{p.pattern})" for i, p in enumerate(self.compiled_patterns[category]))
+            )
+            for category in ['foreign_account', 'gig_income', 'medical_hardship']
+        }
     
-    def analyze_folder(self, folder_path: str) -> Dict:
+    @cached_property
+    def doctype_regex(self) -> Dict:
+        """
+        One alternation per document type: each type is searched once and
+        reported at most once per file (synonyms no longer double-count).
+        Kept per type - a single combined finditer would let greedy patterns
+        like 'tax.*return' swallow other types' matches
+        """
+        return {
+            doc_type: re.compile("|".join(p.pattern for p in doc_patterns))
+            for doc_type, doc_patterns in self.compiled_patterns['document_type'].items()
+        }
+    
+    @cached_property
+    def mapped_regex(self) -> Dict:
+        """
+        Bytes twins of category_regex for memory-mapped .txt files. Mapped bytes
+        are not lowercased, so these match case-insensitively (see _bytes_pattern)
+        """
+        return {
+            category: _bytes_pattern(regex.pattern)
+            for category, regex in self.category_regex.items()
+        }
+    
+    @cached_property
+    def mapped_patterns(self) -> Dict:
+        """
+        Bytes twins of the date/document-type patterns (see mapped_regex)
+        """
+        return {
+            'date': [_bytes_pattern(p.pattern) for p in self.compiled_patterns['date']],
+            'document_type': {
+                doc_type: _bytes_pattern(regex.pattern)
+                for doc_type, regex in self.doctype_regex.items()
+            }
+        }
+    
+    @cached_property
+    def can_scan_mapped(self) -> bool:
+        """
+        True if every pattern has a bytes twin - otherwise large .txt files are decoded
+        """
+        return None not in (
+            *self.mapped_regex.values(),
+            *self.mapped_patterns['date'],
+            *self.mapped_patterns['document_type'].values()
+        )
+    
+    @cached_property
+    def date_db(self):
+        """
+        All date patterns in one Hyperscan database (None -> fall back to `re`)
+        """
+        if hyperscan is None:
+            return None
+        date_patterns = self.compiled_patterns['date']
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.pattern.encode() for p in date_patterns],
+            ids=list(range(len(date_patterns))),
+            elements=len(date_patterns),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(date_patterns)
+        )
+        return db
+    
+    def analyze_folder(self, folder_path: str, now: Optional[datetime] = None) -> Dict:
         """
         Analyze all documents in a folder
         Returns internal analysis for YOUR eyes only
         """
+        now = now or datetime.now()
         folder = Path(folder_path)
         if not folder.exists():
             return {"error": f"Folder not found: {folder_path}"}
         
         analysis = {
-            "scan_date": datetime.now().isoformat(),
+            "scan_date": now.isoformat(),
             "folder": str(folder),
             "files_found": 0,
             "red_flags": [],
+            "flagged_categories": set(),  # O(1) "was CATEGORY flagged?" lookups
             "missing_categories": [],
             "timeline_issues": [],
             "internal_score": 0,
             "recommended_focus": []
         }
         
-        # Scan all files
-        for file_path in folder.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in ['.pdf', '.jpg', '.jpeg', '.png', '.txt', '.doc', '.docx']:
-                analysis["files_found"] += 1
-                file_analysis = self._analyze_file(file_path)
-                
-                if file_analysis["red_flags"]:
-                    analysis["red_flags"].extend(file_analysis["red_flags"])
-                
-                if file_analysis.get("dates"):
-                    analysis.setdefault("dates_found", []).extend(file_analysis["dates"])
+        # Collect files, then analyze them in parallel (OCR/PDF parsing is CPU-bound)
+        file_paths = list(_iter_files(str(folder)))
+        analysis["files_found"] = len(file_paths)
+        
+        # OCR images in one Tesseract run up front; texts are handed to each file's analysis
+        # (pool workers have their own memo and may not share the disk cache)
+        ocr_texts = self._batch_ocr([p for p in file_paths if p.suffix.lower() in ['.jpg', '.jpeg', '.png']])
+        texts = [ocr_texts.get(p) for p in file_paths]
+        
+        # Per-file events are folded in as they arrive - no per-file results held in memory
+        if len(file_paths) > 1 and (
+            len(file_paths) >= PARALLEL_MIN_FILES
+            or sum(map(_file_size, file_paths)) >= PARALLEL_MIN_BYTES
+        ):
+            workers = min(os.cpu_count() or 1, len(file_paths))
+            # Workers get this analyzer's class and config, so per-instance tweaks still apply
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(type(self), self.patterns, self.thresholds,
+                                               self.persist_text)) as executor:
+                for events in executor.map(_analyze_file_worker, file_paths, texts):
+                    self._fold_events(analysis, events)
+        else:
+            for file_path, text in zip(file_paths, texts):
+                self._fold_events(analysis, self._analyze_file_stream(file_path, text))
         
         # Post-analysis
         analysis.update(self._post_analysis(analysis))
@@ -115,6 +349,19 @@ class MitchyVisionPro:
         
         return analysis
     
+    def _fold_events(self, analysis: Dict, events: Iterable[Tuple]) -> None:
+        """
+        Merge one file's analysis events into the folder analysis
+        """
+        for kind, *payload in events:
+            if kind == 'flag':
+                category, message = payload
+                analysis["red_flags"].append(message)
+                if category:
+                    analysis["flagged_categories"].add(category)
+            elif kind == 'date':
+                analysis.setdefault("dates_found", []).append(payload[0])
+    
     def _analyze_file(self, file_path: Path) -> Dict:
         """
         Analyze a single file
@@ -124,45 +371,229 @@ class MitchyVisionPro:
             "filename": file_path.name,
             "file_type": file_path.suffix.lower(),
             "red_flags": [],
+            "flagged_categories": set(),
             "dates": [],
             "detected_types": []
         }
         
+        for kind, *payload in self._analyze_file_stream(file_path):
+            if kind == 'flag':
+                category, message = payload
+                result["red_flags"].append(message)
+                if category:
+                    result["flagged_categories"].add(category)
+            elif kind == 'date':
+                result["dates"].append(payload[0])
+            elif kind == 'type':
+                result["detected_types"].append(payload[0])
+        
+        return result
+    
+    def _analyze_file_stream(self, file_path: Path, text: Optional[str] = None) -> Iterator[Tuple]:
+        """
+        Analyze a single file, yielding findings as they are found:
+        ('flag', category or None, message) / ('date', date_str) / ('type', doc_type)
+        text: already-extracted (lowercased) text, e.g. from _batch_ocr
+        """
         try:
-            # Try to extract text
-            text = self._extract_text(file_path)
+            # Large plain-text files: scan the mapped bytes, no read/decode/lower copies
+            if (file_path.suffix.lower() == '.txt' and file_path.stat().st_size >= MMAP_MIN_BYTES
+                    and self.can_scan_mapped):
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield from self._scan_mapped(mm, file_path)
+                text = ""
+            elif text is None:
+                # Try to extract text
+                text = self._extract_text(file_path)
             
             if text:
                 # Check for patterns
-                for category, patterns in self.patterns.items():
-                    if category in ['foreign_account', 'gig_income', 'medical_hardship']:
-                        for pattern in patterns:
-                            if re.search(pattern, text, re.IGNORECASE):
-                                result["red_flags"].append(f"{category.upper()}: Found '{pattern}' in {file_path.name}")
+                for category, patterns in self.compiled_patterns.items():
+                    if category in self.category_regex:
+                        # One flag per category is enough - stop at the first hit
+                        match = self.category_regex[category].search(text)
+                        if match:
+                            pattern = patterns[int(match.lastgroup[1:])]
+                            yield ('flag', category, f"{category.upper()}: Found '{pattern.pattern}' in {file_path.name}")
+                    
+                    elif category == 'date' and self.date_db is not None:
+                        for date_str in self._scan_dates(text):
+                            yield ('date', date_str)
                     
                     elif category == 'date':
                         for pattern in patterns:
-                            dates = re.findall(pattern, text, re.IGNORECASE)
-                            if dates:
-                                result["dates"].extend(dates)
+                            for date_str in pattern.findall(text):
+                                yield ('date', date_str)
                     
                     elif category == 'document_type':
-                        for doc_type, doc_patterns in patterns.items():
-                            for pattern in doc_patterns:
-                                if re.search(pattern, text, re.IGNORECASE):
-                                    result["detected_types"].append(doc_type)
+                        for doc_type, regex in self.doctype_regex.items():
+                            if regex.search(text):
+                                yield ('type', doc_type)
             
             # File size check (too small might be incomplete)
             file_size = file_path.stat().st_size
             if file_size < 1024:  # Less than 1KB
-                result["red_flags"].append(f"FILE_SIZE: {file_path.name} is very small ({file_size} bytes) - may be incomplete")
+                yield ('flag', None, f"FILE_SIZE: {file_path.name} is very small ({file_size} bytes) - may be incomplete")
             
         except Exception as e:
-            result["red_flags"].append(f"ERROR: Could not analyze {file_path.name}: {str(e)}")
+            yield ('flag', None, f"ERROR: Could not analyze {file_path.name}: {str(e)}")
+    
+    def _scan_mapped(self, mm: mmap.mmap, file_path: Path) -> Iterator[Tuple]:
+        """
+        Same checks as _analyze_file_stream, run directly on a memory-mapped file
+        Only matched substrings are decoded
+        """
+        for category, regex in self.mapped_regex.items():
+            match = regex.search(mm)
+            if match:
+                pattern = self.compiled_patterns[category][int(match.lastgroup[1:])]
+                yield ('flag', category, f"{category.upper()}: Found '{pattern.pattern}' in {file_path.name}")
+        
+        for pattern in self.mapped_patterns['date']:
+            for date_bytes in pattern.findall(mm):
+                yield ('date', date_bytes.decode('utf-8', errors='ignore').lower())
+        
+        for doc_type, regex in self.mapped_patterns['document_type'].items():
+            if regex.search(mm):
+                yield ('type', doc_type)
+    
+    def _scan_dates(self, text: str) -> List[str]:
+        """
+        Find all date strings in one Hyperscan pass
+        Keeps the longest, non-overlapping matches (same as re.findall)
+        """
+        data = text.encode('utf-8')
+        spans = {}
         
-        return result
+        def on_match(pattern_id, start, end, flags, context):
+            if end > spans.get(start, -1):
+                spans[start] = end
+        
+        self.date_db.scan(data, match_event_handler=on_match)
+        
+        dates = []
+        last_end = 0
+        for start in sorted(spans):
+            if start >= last_end:
+                dates.append(data[start:spans[start]].decode('utf-8', errors='ignore'))
+                last_end = spans[start]
+        return dates
     
     def _extract_text(self, file_path: Path) -> str:
+        """
+        Extract text, reusing earlier results for files with identical content
+        Plain .txt files are read directly - hashing them costs as much as reading
+        """
+        if file_path.suffix.lower() == '.txt':
+            return self._read_text(file_path)
+        
+        digest = self._content_digest(file_path)
+        if digest is None:
+            return self._read_text(file_path)
+        
+        if digest in self._text_cache:
+            self._text_cache.move_to_end(digest)
+            return self._text_cache[digest]
+        
+        cache_file = TEXT_CACHE_DIR / f"{digest}.txt"
+        if self.persist_text and cache_file.exists():
+            text = cache_file.read_text(encoding='utf-8')
+            self._memo_text(digest, text)
+        else:
+            text = self._read_text(file_path)
+            self._store_text(digest, text)
+        
+        return text
+    
+    def _content_digest(self, file_path: Path) -> Optional[str]:
+        """
+        Cache key for a file's extracted text
+        """
+        try:
+            return hashlib.blake2b(file_path.read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+    
+    def _store_text(self, digest: str, text: str) -> None:
+        """
+        Save extracted text in memory and (atomically, owner-only) on disk
+        """
+        self._memo_text(digest, text)
+        
+        # Empty text or a placeholder ("[pdf: ...]") means no reader was available - don't persist
+        if not self.persist_text or not text or (text.startswith("[") and text.endswith("]")):
+            return
+        
+        try:
+            TEXT_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+            TEXT_CACHE_DIR.chmod(0o700)  # Tighten a directory created earlier with default permissions
+            cache_file = TEXT_CACHE_DIR / f"{digest}.txt"
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # Cache is best-effort
+    
+    def _memo_text(self, digest: str, text: str) -> None:
+        """
+        Keep text in the in-memory LRU (at most TEXT_MEMO_SIZE entries)
+        """
+        self._text_cache[digest] = text
+        self._text_cache.move_to_end(digest)
+        if len(self._text_cache) > TEXT_MEMO_SIZE:
+            self._text_cache.popitem(last=False)
+    
+    def _batch_ocr(self, image_paths: List[Path]) -> Dict[Path, str]:
+        """
+        OCR all uncached images with ONE Tesseract process (filelist mode)
+        Saves ~100-200ms of traineddata loading per image. Results go into the
+        text cache, and are returned (path -> text, including memo hits) so
+        analyze_folder can hand them to pool workers directly
+        """
+        tesseract = shutil.which("tesseract")
+        if not tesseract:
+            return {}
+        
+        digests = {}
+        pending = {}
+        for image_path in image_paths:
+            digest = self._content_digest(image_path)
+            if not digest:
+                continue
+            digests[image_path] = digest
+            if digest not in self._text_cache and not (
+                    self.persist_text and (TEXT_CACHE_DIR / f"{digest}.txt").exists()):
+                pending.setdefault(digest, image_path)
+        texts = {path: self._text_cache[digest] for path, digest in digests.items() if digest in self._text_cache}
+        
+        if len(pending) < 2:
+            return texts  # Nothing to amortize
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_list = Path(tmp_dir) / "images.txt"
+            file_list.write_text("\n".join(str(p.resolve()) for p in pending.values()), encoding='utf-8')
+            out_base = Path(tmp_dir) / "ocr"
+            try:
+                subprocess.run(
+                    [tesseract, str(file_list), str(out_base), "-c", "page_separator=\f"],
+                    check=True, capture_output=True
+                )
+                pages = (out_base.with_suffix(".txt")).read_text(encoding='utf-8', errors='ignore').split("\f")
+            except (OSError, subprocess.CalledProcessError):
+                return texts  # Fall back to per-file OCR
+        
+        # One page per image, in filelist order
+        if len(pages) < len(pending):
+            return texts
+        ocr = {digest: page_text.lower() for digest, page_text in zip(pending, pages)}
+        for digest, text in ocr.items():
+            self._store_text(digest, text)
+        texts.update((path, ocr[digest]) for path, digest in digests.items() if digest in ocr)
+        return texts
+    
+    def _read_text(self, file_path: Path) -> str:
         """
         Extract text from various file types
         Requires: pip install pymupdf pillow pytesseract
@@ -172,28 +603,23 @@ class MitchyVisionPro:
         try:
             # PDF files
             if file_path.suffix.lower() == '.pdf':
-                try:
-                    import fitz  # PyMuPDF
+                if fitz is not None:
                     doc = fitz.open(file_path)
-                    for page in doc:
-                        text += page.get_text()
+                    # Plain "text" mode, joined once (no quadratic += on large PDFs)
+                    text = "".join(page.get_text("text") for page in doc)
                     doc.close()
-                except ImportError:
-                    # Fallback: try pdfminer
-                    try:
-                        from pdfminer.high_level import extract_text
-                        text = extract_text(file_path)
-                    except ImportError:
-                        text = f"[PDF: {file_path.name}]"
+                elif pdfminer_extract_text is not None:
+                    # Fallback: pdfminer
+                    text = pdfminer_extract_text(file_path)
+                else:
+                    text = f"[PDF: {file_path.name}]"
             
             # Image files
             elif file_path.suffix.lower() in ['.jpg', '.jpeg', '.png']:
-                try:
-                    import pytesseract
-                    from PIL import Image
+                if pytesseract is not None:
                     img = Image.open(file_path)
                     text = pytesseract.image_to_string(img)
-                except ImportError:
+                else:
                     text = f"[IMAGE: {file_path.name}]"
             
             # Text files
@@ -202,7 +628,8 @@ class MitchyVisionPro:
                     if file_path.suffix.lower() == '.txt':
                         text = file_path.read_text(encoding='utf-8', errors='ignore')
                     elif file_path.suffix.lower() == '.docx':
-                        import docx
+                        if docx is None:
+                            raise ImportError("python-docx not installed")
                         doc = docx.Document(file_path)
                         text = '\n'.join([para.text for para in doc.paragraphs])
                 except Exception:
@@ -220,20 +647,18 @@ class MitchyVisionPro:
         results = {}
         
         # Check for foreign accounts without tax docs
-        foreign_flags = [f for f in analysis["red_flags"] if "FOREIGN_ACCOUNT" in f]
+        has_foreign = 'foreign_account' in analysis.get("flagged_categories", ())
         tax_docs = any("tax_return" in str(f).lower() for f in analysis.get("detected_types", []))
         
-        if foreign_flags and not tax_docs:
+        if has_foreign and not tax_docs:
             results["missing_categories"] = ["TAX_DOCUMENTS: Foreign accounts detected but no Schedule B/1040 found"]
         
         # Check timeline
         dates = self._parse_dates(analysis.get("dates", []))
         if len(dates) >= 2:
-            dates.sort()
-            if len(dates) >= 2:
-                timeline_days = (dates[-1] - dates[0]).days
-                if timeline_days > self.thresholds['notice_period_days']:
-                    results["timeline_issues"] = [f"TIMELINE: {timeline_days} days between earliest and latest document - check for gaps"]
+            timeline_days = int((dates.max() - dates.min()) / np.timedelta64(1, 'D'))
+            if timeline_days > self.thresholds['notice_period_days']:
+                results["timeline_issues"] = [f"TIMELINE: {timeline_days} days between earliest and latest document - check for gaps"]
         
         # Check for critical missing documents
         required_docs = ['death_certificate', 'lease', 'bank_statement']
@@ -247,28 +672,36 @@ class MitchyVisionPro:
         
         return results
     
-    def _parse_dates(self, date_strings: List[str]) -> List[datetime]:
+    def _parse_dates(self, date_strings: List[str]) -> np.ndarray:
         """
-        Parse various date formats
+        Parse various date formats into one datetime64[D] array
         """
-        dates = []
+        iso_dates = []
         for date_str in date_strings:
-            try:
-                # Clean the string
-                clean = re.sub(r'[^\d/\-\.]', ' ', date_str).strip()
-                
-                # Try different formats
-                for fmt in ['%m/%d/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m-%d-%Y', '%B %d, %Y', '%d %B %Y']:
-                    try:
-                        dt = datetime.strptime(clean, fmt)
-                        dates.append(dt)
-                        break
-                    except ValueError:
-                        continue
-            except Exception:
+            match = DATE_RE.fullmatch(date_str.strip())
+            if not match:
                 continue
+            
+            fmt = match.lastgroup
+            year = int(match[f'{fmt}_y'])
+            if fmt in ('named', 'dnamed'):
+                month, day = MONTHS.get(match[f'{fmt}_mon'].lower(), 0), int(match[f'{fmt}_d'])
+            elif fmt == 'dash':
+                # DD-MM-YYYY first, MM-DD-YYYY if that isn't a valid date
+                month, day = int(match['dash_b']), int(match['dash_a'])
+                if not self._valid_date(year, month, day):
+                    month, day = day, month
+            else:
+                month, day = int(match[f'{fmt}_m']), int(match[f'{fmt}_d'])
+            
+            if self._valid_date(year, month, day):
+                iso_dates.append(f"{year:04d}-{month:02d}-{day:02d}")
         
-        return dates
+        return np.array(iso_dates, dtype='datetime64[D]')
+    
+    @staticmethod
+    def _valid_date(year: int, month: int, day: int) -> bool:
+        return 1 <= year and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
     
     def _generate_recommendations(self, analysis: Dict) -> List[str]:
         """
@@ -277,13 +710,15 @@ class MitchyVisionPro:
         recs = []
         
         # Based on red flags
-        if any("FOREIGN_ACCOUNT" in flag for flag in analysis["red_flags"]):
+        flagged = analysis.get("flagged_categories", ())
+        
+        if 'foreign_account' in flagged:
             recs.append("FOCUS: Check for Schedule B and FBAR Form 114 for foreign accounts")
         
-        if any("GIG_INCOME" in flag for flag in analysis["red_flags"]):
+        if 'gig_income' in flagged:
             recs.append("FOCUS: Look for 1099-K and app screenshots for gig income")
         
-        if any("MEDICAL_HARDSHIP" in flag for flag in analysis["red_flags"]):
+        if 'medical_hardship' in flagged:
             recs.append("FOCUS: Verify hospital records cover exact dates needed")
         
         # Based on missing documents
@@ -321,6 +756,26 @@ class MitchyVisionPro:
         
         return min(score, 10)
 
+# ==================== PARALLEL FILE WORKERS ====================
+_worker_vision = None
+
+def _init_worker(cls: type, patterns: Dict, thresholds: Dict, persist_text: bool) -> None:
+    """
+    Build one analyzer per worker process, configured like the parent's
+    (compiled pattern databases are not picklable, so each process compiles its own)
+    """
+    global _worker_vision
+    _worker_vision = cls(persist_text=persist_text)
+    _worker_vision.patterns = patterns
+    _worker_vision.thresholds = thresholds
+
+def _analyze_file_worker(file_path: Path, text: Optional[str] = None) -> List[Tuple]:
+    """
+    Process-pool entry point for MitchyVisionPro._analyze_file_stream
+    (generators can't cross processes, so the compact event list is returned)
+    """
+    return list(_worker_vision._analyze_file_stream(file_path, text))
+
 # ==================== AUTO-REPORT GENERATOR ====================
 class AutoReportGenerator:
     """
@@ -328,52 +783,47 @@ class AutoReportGenerator:
     Never share this with clients - it's your cheat sheet
     """
     
-    def generate_internal_report(self, vision_analysis: Dict) -> str:
+    def generate_internal_report(self, vision_analysis: Dict, now: Optional[datetime] = None) -> str:
         """
         Create markdown report for YOUR eyes only
         """
-        report = f"""# MITCHY VISION PRO - INTERNAL ANALYSIS
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+        now = now or datetime.now()
+        parts = [f"""# MITCHY VISION PRO - INTERNAL ANALYSIS
+Generated: {now.strftime('%Y-%m-%d %H:%M')}
 Folder: {vision_analysis.get('folder', 'Unknown')}
 Risk Score: {vision_analysis.get('internal_score', 0)}/10
 
 ## 🔴 RED FLAGS ({len(vision_analysis.get('red_flags', []))})
-"""
+"""]
         
-        for flag in vision_analysis.get('red_flags', []):
-            report += f"- {flag}\n"
+        parts.extend(f"- {flag}\n" for flag in vision_analysis.get('red_flags', []))
         
-        report += f"""
+        parts.append(f"""
 ## 📁 DOCUMENTS DETECTED
 Files scanned: {vision_analysis.get('files_found', 0)}
-"""
+""")
         
         if vision_analysis.get('detected_types'):
             doc_counts = {}
             for doc_type in vision_analysis.get('detected_types', []):
                 doc_counts[doc_type] = doc_counts.get(doc_type, 0) + 1
             
-            for doc_type, count in doc_counts.items():
-                report += f"- {doc_type.replace('_', ' ').title()}: {count}\n"
+            parts.extend(f"- {doc_type.replace('_', ' ').title()}: {count}\n" for doc_type, count in doc_counts.items())
         
-        report += f"""
+        parts.append("""
 ## ⚠️ ISSUES IDENTIFIED
-"""
-        
-        for issue in vision_analysis.get('missing_categories', []):
-            report += f"- ❌ {issue}\n"
+""")
         
-        for issue in vision_analysis.get('timeline_issues', []):
-            report += f"- ⏰ {issue}\n"
+        parts.extend(f"- ❌ {issue}\n" for issue in vision_analysis.get('missing_categories', []))
+        parts.extend(f"- ⏰ {issue}\n" for issue in vision_analysis.get('timeline_issues', []))
         
-        report += f"""
+        parts.append("""
 ## 🎯 YOUR ACTION PLAN (Prioritized)
-"""
+""")
         
-        for i, action in enumerate(vision_analysis.get('recommended_focus', []), 1):
-            report += f"{i}. {action}\n"
+        parts.extend(f"{i}. {action}\n" for i, action in enumerate(vision_analysis.get('recommended_focus', []), 1))
         
-        report += f"""
+        parts.append("""
 ## 📝 INTERNAL NOTES
 1. Check death certificate DATE first
 2. Calculate: Filing date - Vacancy date = ? days
@@ -387,17 +837,18 @@ Files scanned: {vision_analysis.get('files_found', 0)}
 - NEVER claim AI analyzed their case
 - ALWAYS verify findings manually
 - FINAL decision is YOUR human review
-"""
+""")
         
-        return report
+        return "".join(parts)
     
-    def generate_client_checklist(self, vision_analysis: Dict) -> str:
+    def generate_client_checklist(self, vision_analysis: Dict, now: Optional[datetime] = None) -> str:
         """
         Generate SANITIZED checklist for client (no AI mention)
         This is what you actually send
         """
+        now = now or datetime.now()
         checklist = f"""DOCUMENT VERIFICATION CHECKLIST
-Date: {datetime.now().strftime('%Y-%m-%d')}
+Date: {now.strftime('%Y-%m-%d')}
 Case: [Client Reference]
 
 Please verify the following documents are complete:
@@ -456,9 +907,12 @@ def quick_scan(folder_path: str) -> None:
     vision = MitchyVisionPro()
     generator = AutoReportGenerator()
     
+    # One timestamp for the scan, both reports and their filenames
+    now = datetime.now()
+    
     # Run analysis
     print(f"Scanning: {folder_path}")
-    analysis = vision.analyze_folder(folder_path)
+    analysis = vision.analyze_folder(folder_path, now=now)
     
     # Display summary
     print(f"\n📊 Summary:")
@@ -476,16 +930,16 @@ def quick_scan(folder_path: str) -> None:
             print(f"  • {action}")
     
     # Save reports
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     
     # Internal report (YOUR eyes only)
-    internal_report = generator.generate_internal_report(analysis)
+    internal_report = generator.generate_internal_report(analysis, now=now)
     with open(f"vision_internal_{timestamp}.md", "w") as f:
         f.write(internal_report)
     print(f"\n📄 Internal report saved: vision_internal_{timestamp}.md")
     
     # Client checklist (sanitized)
-    client_checklist = generator.generate_client_checklist(analysis)
+    client_checklist = generator.generate_client_checklist(analysis, now=now)
     with open(f"client_checklist_{timestamp}.txt", "w") as f:
         f.write(client_checklist)
     print(f"📋 Client checklist saved: client_checklist_{timestamp}.txt")
@@ -504,6 +958,8 @@ pillow==10.1.0       # Image processing
 pytesseract==0.3.10  # OCR (requires tesseract-ocr installed system-wide)
 pdfminer.six==20221105  # PDF fallback
 python-docx==1.1.0   # Word documents
+numpy                # Date/timeline math
+hyperscan==0.7.7     # Optional: faster date scanning (Linux/macOS)
 """
     
     print("Required packages:")
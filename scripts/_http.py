@@ -0,0 +1,22 @@
+"""
+Shared HTTP session for the lead scripts
+Pools connections per host so repeat calls skip the TCP+TLS handshake
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = 'Mitchy/1.0'
+
+def build_session():
+    session = requests.Session()
+    # Retry only idempotent methods (urllib3 default) - never re-POST a webhook
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50,
+                          max_retries=Retry(total=3, backoff_factor=0.5))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+SESSION = build_session()
@@ -3,34 +3,79 @@ AI Scoring Module
 
 - Trains/uses ML model (e.g., LogisticRegression/sklearn)
 - Inputs: enriched_leads.csv with columns: Urgency Score, AI Relevance, Conversion (binary)
-- Outputs: model.pkl, and adjusted pitches
+- Outputs: model.pkl (+ model.json coefficients for predict), and adjusted pitches
 """
 
+import functools
+import json
+import os
+import numpy as np
 import pandas as pd
-import pickle
-from sklearn.linear_model import LogisticRegression
+
+def _read_leads(csv_path):
+    """Prefer the parquet sidecar written by enrich_leads, unless the CSV is newer"""
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return pd.read_parquet(parquet_path)
+    return pd.read_csv(csv_path)
 
 def train_model(csv_path="enriched_leads.csv"):
-    df = pd.read_csv(csv_path)
+    df = _read_leads(csv_path)
     if "Conversion" not in df.columns:
         print("No Conversion data available, skipping.")
         return
+    # sklearn/joblib only load on the training path - predict needs just the coefficients
+    import joblib
+    from sklearn.linear_model import LogisticRegression
     X = df[["Urgency Score", "AI Relevance Score"]]
     y = df["Conversion"]
     model = LogisticRegression().fit(X, y)
-    with open("ai_lead_model.pkl","wb") as f:
-        pickle.dump(model,f)
+    joblib.dump(model, "ai_lead_model.pkl", compress=3)
+    with open("ai_lead_model.json", "w") as f:
+        json.dump({"w": model.coef_.ravel().tolist(), "b": float(model.intercept_[0])}, f)
+    _load_model.cache_clear()
     print("Model trained: ai_lead_model.pkl")
 
+def _get_model():
+    """
+    (w, b) of the 2-feature LogisticRegression - from the .json coefficients,
+    or the joblib .pkl when the .json is missing or older (reloaded when either changes)
+    """
+    mtimes = {}
+    for path in ("ai_lead_model.json", "ai_lead_model.pkl"):
+        try:
+            mtimes[path] = os.path.getmtime(path)
+        except OSError:
+            pass
+    if not mtimes:
+        raise FileNotFoundError("No trained model (ai_lead_model.json / ai_lead_model.pkl) - run train_model() first")
+    path = max(mtimes, key=lambda p: (mtimes[p], p.endswith(".json")))
+    return _load_model(path, mtimes[path])
+
+@functools.lru_cache(maxsize=2)
+def _load_model(path, mtime):
+    """mtime is only part of the cache key, so a retrained file is picked up"""
+    if path.endswith(".json"):
+        with open(path) as f:
+            params = json.load(f)
+        w, b = params["w"], params["b"]
+    else:
+        import joblib
+        model = joblib.load(path)
+        w, b = model.coef_.ravel(), model.intercept_[0]
+    return np.asarray(w, dtype=np.float32), np.float32(b)
+
 def predict(csv_path="enriched_leads.csv"):
-    with open("ai_lead_model.pkl","rb") as f:
-        model = pickle.load(f)
-    df = pd.read_csv(csv_path)
-    X = df[["Urgency Score", "AI Relevance Score"]]
-    preds = model.predict_proba(X)[:,1]
+    w, b = _get_model()
+    df = _read_leads(csv_path)
+    # Binary 2-feature LogisticRegression - plain float32 sigmoid skips sklearn's dispatch/validation
+    X = df[["Urgency Score", "AI Relevance Score"]].to_numpy(dtype=np.float32)
+    with np.errstate(over='ignore'):
+        preds = 1.0 / (1.0 + np.exp(-(X @ w + b)))
     # Adjust Tier for high prob leads
-    df['Optimized Tier'] = (preds > .7).astype(int) + 1
-    df.to_csv("optimized_leads.csv", index=False)
+    df['Optimized Tier'] = (preds > .7).astype(np.int8) + 1
+    with open("optimized_leads.csv", "wb", buffering=1 << 20) as out:
+        df.to_csv(out, index=False, lineterminator='\n')
     print("Lead priorities updated.")
 
 if __name__ == "__main__":
@@ -8,10 +8,18 @@ Automated Data Sourcing for Mitchell-Lama HPD Pipeline
 """
 
 import os
+import io
+import json
 import time
-import requests
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from scripts._http import SESSION
+except ImportError:  # run directly as python scripts/<name>.py
+    from _http import SESSION
 import openpyxl
 from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
@@ -23,6 +31,13 @@ NYC_VIOLATIONS_URL = "https://data.cityofnewyork.us/resource/wvxf-dwi5.json"
 HUD_API_URL = "https://www.huduser.gov/hudapi/public/multifamily"
 GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID")
 SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_CREDS_JSON", "google-creds.json")
+VIOLATION_PREFIX_CHUNK = 40
+SHEET_CHUNK_ROWS = 500
+SHEET_RANGES_PER_BATCH = 10
+VIOLATION_PARALLEL_MIN_ROWS = 200_000
+DHCR_CACHE_DIR = Path.home() / ".cache" / "mitchy"
+DHCR_CACHE_FILE = DHCR_CACHE_DIR / "dhcr_list.parquet"
+DHCR_CACHE_META = DHCR_CACHE_DIR / "dhcr_list.json"
 
 # Helper: Google Sheets setup
 def get_sheets_service():
@@ -30,30 +45,78 @@ def get_sheets_service():
         SERVICE_ACCOUNT_FILE,
         scopes=['https://www.googleapis.com/auth/spreadsheets']
     )
-    return build('sheets', 'v4', credentials=creds)
+    # httplib2 already negotiates gzip; skip the discovery-doc file cache lookup
+    return build('sheets', 'v4', credentials=creds, cache_discovery=False)
 
 def write_to_sheet(data):
     service = get_sheets_service()
     sheet = service.spreadsheets()
     now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     values = [list(data.columns)] + data.values.tolist()
-    sheet.values().update(
-        spreadsheetId=GOOGLE_SHEET_ID,
-        range="MitchellLama!A1",
-        valueInputOption="RAW",
-        body={"values": values}
-    ).execute()
+    # 500-row ranges, 10 ranges per batchUpdate - keeps each body far below the request size cap
+    ranges = [
+        {"range": f"MitchellLama!A{start + 1}", "values": values[start:start + SHEET_CHUNK_ROWS]}
+        for start in range(0, len(values), SHEET_CHUNK_ROWS)
+    ]
+    for i in range(0, len(ranges), SHEET_RANGES_PER_BATCH):
+        sheet.values().batchUpdate(
+            spreadsheetId=GOOGLE_SHEET_ID,
+            body={"valueInputOption": "RAW", "data": ranges[i:i + SHEET_RANGES_PER_BATCH]}
+        ).execute()
 
 # Step 1: Scrape DHCR site for Mitchell-Lama buildings
+def _load_dhcr_meta(excel_url):
+    """Validators for the cached sheet - empty unless the cache matches this URL"""
+    if not DHCR_CACHE_FILE.exists() or not DHCR_CACHE_META.exists():
+        return {}
+    try:
+        meta = json.loads(DHCR_CACHE_META.read_text())
+    except (OSError, ValueError):
+        return {}
+    return meta if meta.get("url") == excel_url else {}
+
+def _store_dhcr_cache(df, excel_url, headers):
+    if not (headers.get("ETag") or headers.get("Last-Modified")):
+        return
+    try:
+        DHCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Old meta dropped first - it must never vouch for a half-written parquet
+        DHCR_CACHE_META.unlink(missing_ok=True)
+        df.to_parquet(DHCR_CACHE_FILE, compression="zstd", index=False)
+        # Meta written last - a half-written cache just means one more full download
+        DHCR_CACHE_META.write_text(json.dumps({
+            "url": excel_url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }))
+    except (OSError, ValueError, TypeError, ImportError):
+        pass  # Cache is best-effort (pyarrow errors subclass these)
+
 def scrape_dhcr_list():
-    r = requests.get(DHCR_URL)
+    r = SESSION.get(DHCR_URL)
     soup = BeautifulSoup(r.text, "html.parser")
     links = [a['href'] for a in soup.select('a[href$=".xlsx"], a[href$=".xls"], a[href$=".pdf"]')]
     xls_links = [link for link in links if link.endswith(('.xlsx','.xls'))]
     # Fetch first Excel link
     if xls_links:
         excel_url = xls_links[0] if xls_links[0].startswith("http") else "https://hcr.ny.gov" + xls_links[0]
-        df = pd.read_excel(excel_url)
+        # Conditional GET - the list changes ~quarterly, so usually a 304 and the cached frame
+        meta = _load_dhcr_meta(excel_url)
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        resp = SESSION.get(excel_url, headers=headers)
+        if resp.status_code == 304:
+            return pd.read_parquet(DHCR_CACHE_FILE)
+        resp.raise_for_status()
+        # Rust-backed calamine parser; only the three columns we keep are read
+        df = pd.read_excel(
+            io.BytesIO(resp.content), engine="calamine",
+            usecols=['Building Name', 'Address', 'Number of Units'],
+            dtype={'Number of Units': 'Int32'}
+        )
         # Standardize columns
         df = df.rename(columns={
             'Building Name': 'Building',
@@ -61,24 +124,67 @@ def scrape_dhcr_list():
             'Number of Units': 'Units'
         })
         df = df[["Building", "Address", "Units"]]
+        _store_dhcr_cache(df, excel_url, resp.headers)
         return df
     # TODO: Support PDF parsing
     raise Exception("No expected Excel data found on DHCR.")
 
 # Step 2: Cross-reference with NYC Open Data (Violations)
-def enrich_with_nyc_violations(df):
-    # Pull all violations; ideally, filter by property
-    violations_resp = requests.get(NYC_VIOLATIONS_URL, params={"$limit": 50000})
-    violations = pd.DataFrame(violations_resp.json())
-    violations['address'] = violations['house_number'].fillna('') + " " + violations['street_name'].fillna('')
-    # Do a fuzzy join per address
-    def count_violations(building_addr):
-        matches = violations[violations['address'].str.lower().str.contains(building_addr.lower()[:8])]
-        return len(matches), "; ".join(matches['violation_description'].dropna().unique()[:5])
-    df["Violations Count"] = df["Address"].apply(lambda addr: count_violations(addr)[0])
-    df["Violation Descriptions"] = df["Address"].apply(lambda addr: count_violations(addr)[1])
+def _violations_where(prefixes):
+    """SoQL filter matching the same lowercased 8-char address prefix used in the join"""
+    clauses = []
+    for prefix in prefixes:
+        literal = prefix.upper().replace("'", "''")
+        clauses.append(f"starts_with(upper(house_number || ' ' || street_name), '{literal}')")
+    return " OR ".join(clauses)
+
+def fetch_violations(prefixes):
+    """Pull only violations for the given prefixes - filtering happens in Socrata, not here"""
+    prefixes = sorted(set(prefixes))
+    frames = []
+    # Chunk the OR list so the query string stays a reasonable length
+    for i in range(0, len(prefixes), VIOLATION_PREFIX_CHUNK):
+        resp = SESSION.get(NYC_VIOLATIONS_URL, params={
+            "$select": "house_number,street_name,violation_description",
+            "$where": _violations_where(prefixes[i:i + VIOLATION_PREFIX_CHUNK]),
+            "$limit": 50000,
+        })
+        frames.append(pd.DataFrame(resp.json(), columns=["house_number", "street_name", "violation_description"]))
+    if not frames:
+        return pd.DataFrame(columns=["house_number", "street_name", "violation_description"])
+    return pd.concat(frames, ignore_index=True)
+
+def enrich_with_nyc_violations(df, violations=None):
+    prefix = df["Address"].str.lower().str[:8]
+    if violations is None:
+        violations = fetch_violations(prefix.dropna())
+    address = violations['house_number'].fillna('') + " " + violations['street_name'].fillna('')
+    # Fuzzy join on the lowercased 8-char address prefix: aggregate violations
+    # once per prefix, then look each building up (O(N+M) instead of O(N*M)).
+    # Lowercased once; categorical since many violations share a building
+    violations = violations.assign(prefix=address.str.lower().str[:8].astype('category'))
+    per_prefix = aggregate_violations(violations)
+    df["Violations Count"] = prefix.map(per_prefix['count']).fillna(0).astype(int)
+    df["Violation Descriptions"] = prefix.map(per_prefix['descriptions']).fillna("")
     return df
 
+def aggregate_violations(violations):
+    """Per-prefix count + first 5 unique descriptions - fanned out over processes for very large pulls"""
+    workers = os.cpu_count() or 1
+    if len(violations) < VIOLATION_PARALLEL_MIN_ROWS or workers < 2:
+        return _aggregate_violations(violations)
+    # Partition by prefix (not by building) so every group lands whole in one worker
+    part = violations['prefix'].cat.codes % workers
+    parts = [violations[part == i] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return pd.concat(executor.map(_aggregate_violations, parts))
+
+def _aggregate_violations(violations):
+    return violations.groupby('prefix', observed=True).agg(
+        count=('prefix', 'size'),
+        descriptions=('violation_description', lambda s: "; ".join(s.dropna().unique()[:5]))
+    )
+
 # Step 3: Add HUD Units data
 def enrich_with_hud_units(df):
     # (Minimal stub, as API is gated; can extend)
@@ -86,9 +192,17 @@ def enrich_with_hud_units(df):
     return df
 
 # Step 4: Tiering & Urgency
+TIER_EDGES = np.array([10, 25])  # right-inclusive: <=10 -> 3, <=25 -> 2, above -> 1
+TIER_LABELS = np.array([3, 2, 1], dtype=np.int8)
+
 def compute_tiers(df):
-    df["Urgency Score"] = df["Violations Count"] * 2 + df["Units"] / 10
-    df["Tier"] = pd.cut(df["Urgency Score"], [0, 10, 25, 9999], labels=[3,2,1])
+    violations = df["Violations Count"].to_numpy(dtype=np.float64, na_value=np.nan)
+    units = df["Units"].to_numpy(dtype=np.float64, na_value=np.nan)
+    scores = violations * 2 + units / 10
+    df["Urgency Score"] = scores
+    # searchsorted on the raw array instead of pd.cut's IntervalIndex lookup
+    tiers = TIER_LABELS[np.searchsorted(TIER_EDGES, scores)]
+    df["Tier"] = pd.arrays.IntegerArray(tiers, np.isnan(scores))
     return df
 
 def main():
@@ -10,52 +10,189 @@ Outputs enriched CSV or updates Sheet.
 """
 
 import os
-import requests
+import re
+import asyncio
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+import aiohttp
 import pandas as pd
-from time import sleep
+import pyarrow as pa
+import pyarrow.parquet as pq
+from aiolimiter import AsyncLimiter
 from openai import OpenAI
+try:
+    from scripts._http import USER_AGENT
+except ImportError:  # run directly as python scripts/<name>.py
+    from _http import USER_AGENT
 
 GOOGLE_SHEET_ID = os.getenv('GOOGLE_SHEET_ID')
 HUNTER_IO_KEY = os.getenv('HUNTER_IO_KEY')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 CLEARBIT_KEY = os.getenv('CLEARBIT_KEY')
 
-def hunter_email_lookup(domain, company):
-    res = requests.get(f"https://api.hunter.io/v2/domain-search", params=dict(
-        domain=domain, company=company, api_key=HUNTER_IO_KEY
-    ))
-    if res.status_code == 200:
-        data = res.json()
-        if data.get("data", {}).get("emails"):
-            return data["data"]["emails"][0].get("value", ""), data["data"]["emails"][0].get("first_name", "")
+# Provider rate caps (replace the old blanket sleep(1) per row)
+HUNTER_RATE = (10, 1)    # 10 req/s
+OPENAI_RATE = (60, 60)   # 60 req/min
+# AsyncLimiters are bound to one event loop - rebuilt by _bind_limiters when the loop changes
+HUNTER_LIMITER = None
+OPENAI_LIMITER = None
+_limiter_loop = None
+MAX_CONCURRENT_ROWS = 16
+CSV_CHUNK_ROWS = 500
+CSV_WRITE_BUFFER = 1 << 20
+SCORE_BATCH_SIZE = 20
+_DIGIT_RE = re.compile(r'\d+')
+
+# ==================== SCORE CACHE ====================
+# Violation descriptions repeat heavily across Mitchell-Lama buildings
+SCORE_CACHE_PATH = Path.home() / ".cache" / "mitchy" / "openai_scores.sqlite"
+_score_memo = {}
+_score_inflight = {}
+_score_db = None
+
+def _score_key(desc):
+    """sha256 of the whitespace/case-normalized description"""
+    normalized = " ".join(str(desc).split()).lower()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+def _score_store():
+    global _score_db
+    if _score_db is None:
+        SCORE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _score_db = sqlite3.connect(SCORE_CACHE_PATH)
+        _score_db.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, score INTEGER NOT NULL)")
+    return _score_db
+
+def _cached_score(key):
+    if key not in _score_memo:
+        row = _score_store().execute("SELECT score FROM scores WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        _score_memo[key] = row[0]
+    return _score_memo[key]
+
+def _remember_scores(pairs):
+    """Cache (key, score) pairs - one transaction (one fsync) for the lot"""
+    pairs = list(pairs)
+    _score_memo.update(pairs)
+    db = _score_store()
+    db.executemany("INSERT OR REPLACE INTO scores (key, score) VALUES (?, ?)", pairs)
+    db.commit()
+
+async def hunter_email_lookup(session, domain, company):
+    async with HUNTER_LIMITER:
+        # aiohttp rejects None query values (requests silently dropped them)
+        params = {k: v for k, v in dict(domain=domain, company=company, api_key=HUNTER_IO_KEY).items() if v is not None}
+        async with session.get("https://api.hunter.io/v2/domain-search", params=params) as res:
+            if res.status == 200:
+                data = await res.json()
+                if data.get("data", {}).get("emails"):
+                    return data["data"]["emails"][0].get("value", ""), data["data"]["emails"][0].get("first_name", "")
     return "", ""
 
-def openai_relevance_score(desc):
+async def openai_relevance_score(session, desc):
     if not OPENAI_API_KEY:
         return 0
+    key = _score_key(desc)
+    score = _cached_score(key)
+    if score is not None:
+        return score
+    # Identical descriptions in one batch share a single request
+    pending = _score_inflight.get(key)
+    if pending is None:
+        pending = asyncio.ensure_future(_request_relevance_score(session, desc))
+        _score_inflight[key] = pending
+        try:
+            score = await pending
+        finally:
+            del _score_inflight[key]
+        if score is None:
+            return 0
+        _remember_scores([(key, score)])
+        return score
+    score = await pending
+    return 0 if score is None else score
+
+async def _request_relevance_score(session, desc):
+    """OpenAI call - None on a failed request so it is never cached"""
     prompt = f"Rate 0-10: How relevant is this apartment violation description for pitching HPD calibration? Violations: {desc}"
-    resp = requests.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers={'Authorization': f'Bearer {OPENAI_API_KEY}'},
-        json={
-            "model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.2, "max_tokens": 10,
-        }
-    )
-    if resp.status_code == 200:
-        content = resp.json()["choices"][0]["message"]["content"]
-        # Extract digit score
-        return int(''.join(filter(str.isdigit, content)))
-    return 0
+    async with OPENAI_LIMITER:
+        async with session.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={'Authorization': f'Bearer {OPENAI_API_KEY}'},
+            json={
+                "model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.2, "max_tokens": 10,
+            }
+        ) as resp:
+            if resp.status == 200:
+                content = (await resp.json())["choices"][0]["message"]["content"]
+                # First run of digits - "7/10" is 7, a reply with no digits is a miss
+                match = _DIGIT_RE.search(content)
+                return int(match.group(0)) if match else None
+    return None
 
-def enrich_lead_row(row):
+async def prefetch_relevance_scores(session, descs):
+    """Score uncached descriptions SCORE_BATCH_SIZE per request into the cache"""
+    if not OPENAI_API_KEY:
+        return
+    pending = {}
+    for desc in descs:
+        key = _score_key(desc)
+        if key not in pending and _cached_score(key) is None:
+            pending[key] = desc
+    keys = list(pending)
+    batches = [keys[i:i + SCORE_BATCH_SIZE] for i in range(0, len(keys), SCORE_BATCH_SIZE)]
+    results = await asyncio.gather(*(
+        _request_relevance_batch(session, [pending[k] for k in batch]) for batch in batches
+    ))
+    for batch, scores in zip(batches, results):
+        # Malformed batch replies are skipped - those rows fall back to per-row scoring
+        if scores is not None:
+            _remember_scores(zip(batch, scores))
+
+async def _request_relevance_batch(session, descs):
+    """One OpenAI call for many descriptions - None unless it returns one int per item"""
+    numbered = "\n".join(f"{i}. {' '.join(str(desc).split())}" for i, desc in enumerate(descs, 1))
+    async with OPENAI_LIMITER:
+        async with session.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={'Authorization': f'Bearer {OPENAI_API_KEY}'},
+            json={
+                "model": "gpt-3.5-turbo",
+                "messages": [
+                    {"role": "system", "content": (
+                        "Rate 0-10 how relevant each numbered apartment violation description is for pitching "
+                        "HPD calibration. Return a JSON object {\"scores\": [...]} with one integer per item, in order."
+                    )},
+                    {"role": "user", "content": numbered},
+                ],
+                "temperature": 0.2, "max_tokens": 8 * len(descs) + 20,
+                "response_format": {"type": "json_object"},
+            }
+        ) as resp:
+            if resp.status != 200:
+                return None
+            content = (await resp.json())["choices"][0]["message"]["content"]
+    try:
+        scores = [int(score) for score in json.loads(content)["scores"]]
+    except (ValueError, TypeError, KeyError):
+        return None
+    return scores if len(scores) == len(descs) else None
+
+async def enrich_lead_row_async(session, row):
     # Try to infer domain from address/building
     domain_guess = f"{row['Building'].replace(' ','').lower()}.com"
-    pm_email, pm_name = hunter_email_lookup(domain_guess, row['Building'])
     linked_in_url = f"https://www.linkedin.com/search/results/people/?keywords={row['Building'].replace(' ','+')}+nyc+property+manager"
     phone = ""  # Could be added from an external enrichment API
 
-    ai_score = openai_relevance_score(row.get('Violation Descriptions',''))
+    # Hunter and OpenAI lookups are independent - run them concurrently
+    (pm_email, pm_name), ai_score = await asyncio.gather(
+        hunter_email_lookup(session, domain_guess, row['Building']),
+        openai_relevance_score(session, row.get('Violation Descriptions',''))
+    )
     return {
         "Property Manager Name": pm_name,
         "Email": pm_email,
@@ -64,18 +201,71 @@ def enrich_lead_row(row):
         "AI Relevance Score": ai_score
     }
 
+def _bind_limiters():
+    """Limiters for the running loop - kept across calls on the same loop, so caps span chunks"""
+    global HUNTER_LIMITER, OPENAI_LIMITER, _limiter_loop
+    loop = asyncio.get_running_loop()
+    if loop is not _limiter_loop:
+        HUNTER_LIMITER = AsyncLimiter(*HUNTER_RATE)
+        OPENAI_LIMITER = AsyncLimiter(*OPENAI_RATE)
+        _limiter_loop = loop
+
+async def enrich_rows(rows):
+    """Enrich all rows concurrently over one pooled HTTP session"""
+    _bind_limiters()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ROWS)
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=32), headers={'User-Agent': USER_AGENT}
+    ) as session:
+        await prefetch_relevance_scores(session, [row.get('Violation Descriptions','') for row in rows])
+
+        async def bounded(row):
+            async with semaphore:
+                return await enrich_lead_row_async(session, row)
+        return await asyncio.gather(*(bounded(row) for row in rows))
+
+def enrich_lead_row(row):
+    return asyncio.run(enrich_rows([row]))[0]
+
 def main():
-    # Load sheet/CSV
-    df = pd.read_csv("master_leads.csv")
-    out_rows = []
-    for idx, row in df.iterrows():
-        enriched = enrich_lead_row(row)
-        for key, val in enriched.items():
-            df.at[idx, key] = val
-        sleep(1)  # Prevent rate limiting
-    df.to_csv("enriched_leads.csv", index=False)
+    # One event loop for the whole file - rate limits carry over from chunk to chunk
+    asyncio.run(_enrich_csv())
     print("Enriched leads saved.")
     # Optionally, update Google Sheet here
 
+async def _enrich_csv():
+    # Load sheet/CSV in chunks so memory stays O(chunk) on large lead lists
+    first = True
+    # Typed parquet sidecar for ai_scoring; CSV stays the format for external consumers
+    Path("enriched_leads.parquet").unlink(missing_ok=True)
+    writer = None
+    # One 1 MiB-buffered handle for every chunk; closed before the sidecar so the parquet stays newer
+    with open("enriched_leads.csv", "wb", buffering=CSV_WRITE_BUFFER) as out:
+        for chunk in pd.read_csv("master_leads.csv", chunksize=CSV_CHUNK_ROWS):
+            results = await enrich_rows([row for _, row in chunk.iterrows()])
+            if results:
+                # One frame build for the chunk; assign overwrites any stale enrichment columns
+                enriched = pd.DataFrame(results, index=chunk.index)
+                chunk = chunk.assign(**{col: enriched[col] for col in enriched.columns})
+            chunk.to_csv(out, header=first, index=False, lineterminator='\n')
+            first = False
+            if writer is not False:
+                writer = _write_parquet_chunk(writer, chunk)
+    if writer:
+        writer.close()
+
+def _write_parquet_chunk(writer, chunk):
+    """Append to the sidecar - False (and no sidecar) once a chunk's types drift from the first"""
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    if writer is None:
+        writer = pq.ParquetWriter("enriched_leads.parquet", table.schema, compression="zstd")
+    try:
+        writer.write_table(table.cast(writer.schema))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        writer.close()
+        Path("enriched_leads.parquet").unlink(missing_ok=True)
+        return False
+    return writer
+
 if __name__ == "__main__":
     main()
@@ -8,8 +8,12 @@ Outreach Automation Script
 """
 
 import os
-import csv
+import string
+import pandas as pd
 from hubspot import HubSpot
+from hubspot.crm.contacts import (
+    BatchInputSimplePublicObjectBatchInputForCreate, SimplePublicObjectBatchInputForCreate
+)
 import requests
 
 HUBSPOT_API_KEY = os.getenv("HUBSPOT_API_KEY")
@@ -22,6 +26,18 @@ TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 EMAIL_TEMPLATE = "Subject: 2 Free HPD Calibration Reviews for {Building} - 24-Hour Turnaround\n\nHello {Manager},\n\nWe'd like to offer a complimentary HPD calibration review for your property, {Building}."
 SMS_TEMPLATE = "Hi {Manager}, get a free HPD calibration review for {Building}. Fast, no-commitment."
 
+HUBSPOT_BATCH_SIZE = 100  # crm/v3 contacts batch/create limit
+LEAD_CHUNK_ROWS = 500
+
+def render_template(template, frame):
+    """Vectorized str.format - one Series concatenation per template piece, not one .format per lead"""
+    out = pd.Series("", index=frame.index, dtype=object)
+    for literal, field, _, _ in string.Formatter().parse(template):
+        out = out + literal
+        if field is not None:
+            out = out + frame[field].astype(str)
+    return out
+
 def send_email_mailchimp(to_email, subject, body):
     # Minimal illustration, see Mailchimp API docs for production use
     print(f"Would send Mailchimp email to {to_email}: {subject}")
@@ -33,21 +49,51 @@ def send_sms_twilio(phone, message):
 def send_linkedin_message(profile_url, message):
     print(f"Would send LinkedIn message to {profile_url}: {message}")
 
+def import_leads_to_hubspot(leads):
+    """Create contacts HUBSPOT_BATCH_SIZE per call instead of one request per lead"""
+    if not leads:
+        return
+    if not HUBSPOT_API_KEY:
+        print(f"Would import {len(leads)} leads to HubSpot")
+        return
+    client = HubSpot(access_token=HUBSPOT_API_KEY)
+    for i in range(0, len(leads), HUBSPOT_BATCH_SIZE):
+        inputs = [
+            SimplePublicObjectBatchInputForCreate(properties={
+                "email": lead['Email'],
+                "firstname": lead.get("Property Manager Name", ""),
+                "company": lead['Building'],
+                "phone": lead.get('Phone', ""),
+            })
+            for lead in leads[i:i + HUBSPOT_BATCH_SIZE]
+        ]
+        client.crm.contacts.batch_api.create(BatchInputSimplePublicObjectBatchInputForCreate(inputs=inputs))
+
 def post_tweet(message):
     print(f"Would tweet: {message}")
 
 def outreach_main():
-    with open("enriched_leads.csv") as f:
-        leads = list(csv.DictReader(f))
-    for lead in leads:
-        if not lead['Email']:
+    # Stream in chunks - only one chunk and the pending HubSpot batch are held in memory.
+    # Everything as str with no NaN parsing, matching the csv.DictReader values used before
+    batch = []
+    for chunk in pd.read_csv("enriched_leads.csv", chunksize=LEAD_CHUNK_ROWS, dtype=str, keep_default_na=False):
+        leads = chunk[chunk['Email'] != ""]
+        if leads.empty:
             continue
-        subject = EMAIL_TEMPLATE.format(Building=lead['Building'], Manager=lead.get("Property Manager Name","Manager"))
-        sms = SMS_TEMPLATE.format(Building=lead['Building'], Manager=lead.get("Property Manager Name","Manager"))
-        send_email_mailchimp(lead['Email'], subject, subject)
-        if lead['Phone']:
-            send_sms_twilio(lead['Phone'], sms)
-        send_linkedin_message(lead['LinkedIn'], sms)
+        manager = leads["Property Manager Name"] if "Property Manager Name" in leads else "Manager"
+        fields = pd.DataFrame({"Building": leads['Building'], "Manager": manager}, index=leads.index)
+        subjects = render_template(EMAIL_TEMPLATE, fields)
+        smses = render_template(SMS_TEMPLATE, fields)
+        for lead, subject, sms in zip(leads.to_dict('records'), subjects, smses):
+            batch.append(lead)
+            if len(batch) == HUBSPOT_BATCH_SIZE:
+                import_leads_to_hubspot(batch)
+                batch = []
+            send_email_mailchimp(lead['Email'], subject, subject)
+            if lead['Phone']:
+                send_sms_twilio(lead['Phone'], sms)
+            send_linkedin_message(lead['LinkedIn'], sms)
+    import_leads_to_hubspot(batch)
 
     # Post a Twitter hook for outreach week
     post_tweet("Offering free HPD calibration reviews – Mitchell-Lama managers DM us! #NYCHousing")
@@ -4,19 +4,35 @@ Posts content hooks, notifies via Slack if hits found
 """
 
 import os
-import requests
+import asyncio
+import aiohttp
+try:
+    from scripts._http import SESSION, USER_AGENT
+except ImportError:  # run directly as python scripts/<name>.py
+    from _http import SESSION, USER_AGENT
 
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 
+async def post_to_slack(session, tweet):
+    async with session.post(SLACK_WEBHOOK_URL, json={"text": f"New ML HPD Tweet: {tweet['text']}"}) as resp:
+        return resp.status
+
+async def forward_to_slack(tweets):
+    """Post all tweets concurrently over one keep-alive session"""
+    async with aiohttp.ClientSession(headers={'User-Agent': USER_AGENT}) as session:
+        return await asyncio.gather(*(post_to_slack(session, tweet) for tweet in tweets))
+
 def monitor_mentions():
     headers = {"Authorization": f"Bearer {TWITTER_BEARER_TOKEN}"}
     params = {'query':'Mitchell-Lama HPD','max_results':10}
     url = "https://api.twitter.com/2/tweets/search/recent"
-    r = requests.get(url, headers=headers, params=params)
+    # Bearer stays per-request so it never rides along to the Slack webhook
+    r = SESSION.get(url, headers=headers, params=params)
     tweets = r.json().get("data")
-    for tweet in tweets or []:
-        requests.post(SLACK_WEBHOOK_URL, json={"text": f"New ML HPD Tweet: {tweet['text']}"})
+    if not tweets:
+        return
+    asyncio.run(forward_to_slack(tweets))
 
 if __name__ == "__main__":
     monitor_mentions()
@@ -15,5 +15,12 @@ class TestAIScoring(unittest.TestCase):
         ai_scoring.train_model("enriched_leads.csv")
         self.assertTrue(os.path.exists("ai_lead_model.pkl"))
 
+    def test_predict_falls_back_to_pkl(self):
+        self.test_train_model()
+        os.remove("ai_lead_model.json")
+        self.addCleanup(os.remove, "optimized_leads.csv")
+        ai_scoring.predict("enriched_leads.csv")
+        self.assertIn("Optimized Tier", pd.read_csv("optimized_leads.csv").columns)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pandas as pd
 from scripts import data_sourcing
 
@@ -9,5 +10,32 @@ class TestDataSourcing(unittest.TestCase):
         self.assertIn('Tier', df2.columns)
         self.assertEqual(list(df2['Tier']), [3,2,1])
 
+    def test_compute_tiers_edges(self):
+        df = pd.DataFrame({"Violations Count":[0, 6000, np.nan], "Units":[0, 0, 10]})
+        df2 = data_sourcing.compute_tiers(df)
+        self.assertEqual(str(df2['Tier'].dtype), 'Int8')
+        self.assertEqual(df2['Tier'][0], 3)  # score 0
+        self.assertEqual(df2['Tier'][1], 1)  # score above 9999
+        self.assertIs(df2['Tier'][2], pd.NA)  # no violation count
+
+    def test_enrich_with_nyc_violations(self):
+        df = pd.DataFrame({"Address": ["123 Main Street", "9 Elm Rd"]})
+        violations = pd.DataFrame({
+            "house_number": ["123", "123", "123", "123", "123", "123", "1234"],
+            "street_name": ["MAIN ST", "MAIN ST", "MAIN ST", "MAIN ST", "MAIN AVE", "MAIN ST", "MAIN ST"],
+            "violation_description": ["a", "b", "c", "d", "e", "f", "g"],
+        })
+        df2 = data_sourcing.enrich_with_nyc_violations(df, violations=violations)
+        # "123 main" prefix only - "1234 mai" does not start with it
+        self.assertEqual(list(df2["Violations Count"]), [6, 0])
+        self.assertEqual(list(df2["Violation Descriptions"]), ["a; b; c; d; e", ""])
+
+    def test_enrich_with_nyc_violations_empty(self):
+        df = pd.DataFrame({"Address": ["123 Main Street"]})
+        violations = pd.DataFrame({"house_number": [], "street_name": [], "violation_description": []}, dtype=object)
+        df2 = data_sourcing.enrich_with_nyc_violations(df, violations=violations)
+        self.assertEqual(list(df2["Violations Count"]), [0])
+        self.assertEqual(list(df2["Violation Descriptions"]), [""])
+
 if __name__ == "__main__":
     unittest.main()
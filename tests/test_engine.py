@@ -0,0 +1,68 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import engine
+
+FAKE_TESSERACT = """#!{python}
+import sys
+with open({log!r}, 'a') as log:
+    log.write('run\\n')
+file_list, out_base = sys.argv[1], sys.argv[2]
+with open(file_list) as f:
+    n = len(f.read().splitlines())
+with open(out_base + '.txt', 'w') as out:
+    out.write('\\f'.join(['Uber payout'] * n))
+"""
+
+class _FakePytesseract:
+    """Per-file OCR stand-in - logs a run like the fake binary does"""
+    def __init__(self, log):
+        self.log = log
+
+    def image_to_string(self, img):
+        with open(self.log, 'a') as log:
+            log.write('run\n')
+        return 'Uber payout'
+
+class TestBatchOcr(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.log = self.root / "tesseract.log"
+        bin_dir = self.root / "bin"
+        bin_dir.mkdir()
+        tesseract = bin_dir / "tesseract"
+        tesseract.write_text(FAKE_TESSERACT.format(python=sys.executable, log=str(self.log)))
+        tesseract.chmod(tesseract.stat().st_mode | stat.S_IXUSR)
+        self.folder = self.root / "docs"
+        self.folder.mkdir()
+        for i in range(3):
+            (self.folder / f"scan{i}.png").write_bytes(bytes([i]) * 2048)
+        for patcher in (
+            mock.patch.dict(os.environ, {"PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}),
+            mock.patch.object(engine, "PARALLEL_MIN_FILES", 2),
+            mock.patch.object(engine, "pytesseract", _FakePytesseract(str(self.log))),
+            mock.patch.object(engine, "Image", mock.Mock(), create=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_pool_path_runs_tesseract_once(self):
+        vision = engine.MitchyVisionPro(persist_text=False)
+        analysis = vision.analyze_folder(str(self.folder))
+        self.assertEqual(self.log.read_text().count('run'), 1)
+        gig_flags = [f for f in analysis["red_flags"] if f.startswith("GIG_INCOME")]
+        self.assertEqual(len(gig_flags), 3)
+
+class TestFileSize(unittest.TestCase):
+    def test_vanished_file_counts_as_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(engine._file_size(Path(tmp) / "gone.pdf"), 0)
+
+if __name__ == "__main__":
+    unittest.main()
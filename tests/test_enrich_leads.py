@@ -1,6 +1,34 @@
+import asyncio
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 from scripts import enrich_leads
 
+class _FakeResponse:
+    def __init__(self, content):
+        self.status = 200
+        self._content = content
+
+    async def json(self):
+        return {"choices": [{"message": {"content": self._content}}]}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class _FakeSession:
+    """Stands in for aiohttp.ClientSession - every OpenAI reply is `content`"""
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        return _FakeResponse(self.content)
+
 class TestEnrichLeads(unittest.TestCase):
     def test_enrich_lead_row(self):
         fake_row = {"Building":"Test", "Address":"123 Flatbush Ave", "Violation Descriptions":"Broken doors"}
@@ -8,5 +36,41 @@ class TestEnrichLeads(unittest.TestCase):
         self.assertIn("Property Manager Name", out)
         self.assertIn("AI Relevance Score", out)
 
+class TestRelevanceScore(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for name, value in (
+            ("OPENAI_API_KEY", "test-key"),
+            ("SCORE_CACHE_PATH", Path(tmp.name) / "scores.sqlite"),
+            ("_score_db", None),
+            ("_score_memo", {}),
+        ):
+            patcher = mock.patch.object(enrich_leads, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self._close_db)
+
+    def _close_db(self):
+        if enrich_leads._score_db is not None:
+            enrich_leads._score_db.close()
+
+    def _score(self, session, desc):
+        async def run():
+            enrich_leads._bind_limiters()
+            return await enrich_leads.openai_relevance_score(session, desc)
+        return asyncio.run(run())
+
+    def test_first_digits_are_the_score(self):
+        self.assertEqual(self._score(_FakeSession("7/10"), "Broken doors"), 7)
+        # Cached - a second lookup makes no request
+        session = _FakeSession("3")
+        self.assertEqual(self._score(session, "broken  DOORS"), 7)
+        self.assertEqual(session.calls, 0)
+
+    def test_reply_without_digits_is_not_cached(self):
+        self.assertEqual(self._score(_FakeSession("Very relevant"), "Leaky roof"), 0)
+        self.assertIsNone(enrich_leads._cached_score(enrich_leads._score_key("Leaky roof")))
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import pandas as pd
 from scripts import outreach
 
 class TestOutreach(unittest.TestCase):
@@ -14,5 +15,11 @@ class TestOutreach(unittest.TestCase):
         self.assertIn('Bolden', email)
         self.assertIn('Chris', email)
 
+    def test_render_template_matches_format(self):
+        frame = pd.DataFrame({'Building': ['Bolden', 'Lennox'], 'Manager': ['Chris', '']})
+        for template in (outreach.EMAIL_TEMPLATE, outreach.SMS_TEMPLATE):
+            expected = [template.format(**lead) for lead in frame.to_dict('records')]
+            self.assertEqual(list(outreach.render_template(template, frame)), expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,64 @@
+import io
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+import vision
+from vision import Document, HPDComplianceVerifier, SecureClientPortal, SuccessionCase
+
+def _case(*doc_types):
+    now = datetime(2024, 1, 1)
+    docs = [Document(doc_type, "0" * 64, now, "Client") for doc_type in doc_types]
+    return SuccessionCase("case-1", "1000010001", docs, now, now - timedelta(days=30))
+
+def _rules_violated(case):
+    report = HPDComplianceVerifier().verify_case(case)
+    return {violation["rule"] for violation in report["rule_violations"]}
+
+class TestUtilityMatching(unittest.TestCase):
+    def _check_both_scanners(self, case, expect_uti01):
+        for automaton in (vision._AUTOMATON, None):
+            with self.subTest(automaton=automaton is not None), \
+                    mock.patch.object(vision, "_AUTOMATON", automaton):
+                self.assertEqual("UTI-01" in _rules_violated(case), expect_uti01)
+
+    def test_gas_inside_a_word_is_not_a_utility_bill(self):
+        self._check_both_scanners(_case(*["Passport for Las Vegas trip"] * 12), True)
+
+    def test_utility_bill_phrases_count(self):
+        bills = ["Con Ed Bill", "Con Edison statement", "National Grid gas bill", "Electric bill"] * 3
+        self._check_both_scanners(_case(*bills), False)
+
+class TestReportShape(unittest.TestCase):
+    def test_clean_and_failing_reports_use_lists(self):
+        bills = _case(*["Con Ed Bill"] * 12)
+        clean = HPDComplianceVerifier().verify_case(bills)
+        failing = HPDComplianceVerifier().verify_case(_case("Uber earnings"))
+        self.assertEqual(clean["compliance_score"], 100.0)
+        for report in (clean, failing):
+            for key in ("rule_violations", "missing_documents", "recommended_actions", "public_citations"):
+                self.assertIsInstance(report[key], list)
+        clean["public_citations"].clear()
+        self.assertTrue(HPDComplianceVerifier().verify_case(bills)["public_citations"])
+
+class TestMaskCache(unittest.TestCase):
+    def test_mask_cache_is_bounded(self):
+        verifier = HPDComplianceVerifier()
+        with mock.patch.object(vision, "MASK_CACHE_SIZE", 4):
+            for i in range(10):
+                verifier.verify_case(_case(f"Con Ed Bill {i}"))
+        self.assertEqual(list(verifier._mask_cache), [f"Con Ed Bill {i}" for i in range(6, 10)])
+
+class TestHashContent(unittest.TestCase):
+    def test_file_objects_hash_like_their_contents(self):
+        text = "Con Ed Bill – März\n" * 1000
+        expected = SecureClientPortal._hash_content(text)
+        self.assertEqual(SecureClientPortal._hash_content(io.BytesIO(text.encode())), expected)
+        self.assertEqual(SecureClientPortal._hash_content(io.StringIO(text)), expected)
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+            f.write(text)
+            f.seek(0)
+            self.assertEqual(SecureClientPortal._hash_content(f), expected)
+
+if __name__ == "__main__":
+    unittest.main()
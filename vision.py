@@ -21,13 +21,40 @@ IT DOES:
 """
 
 # ==================== CORE VERIFICATION ENGINE ====================
+import io
+import re
 import json
+import time
 import hashlib
+import secrets
+import threading
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
+try:
+    import ahocorasick  # Optional: one-pass multi-pattern doc_type scan
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # Optional: faster report export
+except ImportError:
+    orjson = None
+
+NOTICE_DEADLINE_DAYS = 90  # SUC-04
+MIN_UTILITY_RECORDS = 12  # UTI-01: months of utility bills
+UPLOAD_CHUNK_BYTES = 1 << 20
+SESSION_TTL_SECONDS = 24 * 60 * 60  # Matches the "expires" stamp on each session
+MAX_ACTIVE_SESSIONS = 10_000
+MASK_CACHE_SIZE = 4096  # Distinct doc_type masks kept per verifier
+LEGAL_DISCLAIMER = "Verification against published HPD rules only. Not a guarantee of approval."
+
 class HPDRule(Enum):
     """PUBLISHED HPD rules only - no 'secret' patterns"""
     AST_01 = "Foreign Account Declaration (Schedule B + FBAR for accounts >$10k)"
@@ -37,14 +64,14 @@ class HPDRule(Enum):
     RES_02 = "Residency Proof (2+ years continuous occupancy)"
     MED_01 = "Medical Hardship Documentation (Hospital records for delays)"
     
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Document:
-    """Legal document with verification metadata"""
+    """Legal document with verification metadata - immutable once uploaded"""
     doc_type: str
     content_hash: str  # For integrity, not tracking
     upload_date: datetime
     source: str  # e.g., "Hospital", "Bank", "Employer"
-    metadata: Dict = field(default_factory=dict)
+    metadata: Dict = field(default_factory=dict, hash=False)  # Not part of the hash - dicts aren't hashable
     
     def verify_integrity(self) -> bool:
         """Basic document integrity check"""
@@ -54,7 +81,7 @@ class Document:
         """Check if document is too old"""
         return (datetime.now() - self.upload_date).days > max_age_days
 
-@dataclass
+@dataclass(slots=True)
 class SuccessionCase:
     """Case representation - ANONYMIZED for privacy"""
     case_id: str  # GUID, not real identifier
@@ -69,6 +96,158 @@ class SuccessionCase:
             return (self.submission_date - self.vacancy_date).days
         return None
 
+@dataclass(frozen=True)
+class Signals:
+    """Every rule input derived from a case's documents - built in ONE pass"""
+    has_schedule_b: bool
+    has_fbar: bool
+    has_1099k: bool
+    has_hospital: bool
+    has_foreign: bool
+    has_gig: bool
+    utility_count: int
+
+# ==================== PUBLISHED RULES ====================
+# PUBLIC HPD rules database - from published guidelines
+_RULES = MappingProxyType({
+    HPDRule.AST_01: MappingProxyType({
+        "description": "Foreign financial accounts >$10k must be declared",
+        "required_docs": ("Schedule_B", "FBAR_114", "Bank_Statement"),
+        "threshold": 10000,
+        "public_citation": "HPD Asset Declaration Guidelines §3.2"
+    }),
+    HPDRule.INC_03: MappingProxyType({
+        "description": "Gig economy income requires 1099-K + platform verification",
+        "required_docs": ("Form_1099K", "Platform_Screenshots", "Bank_Deposits"),
+        "threshold": 600,  # IRS 1099-K threshold
+        "public_citation": "HPD Income Verification Protocol §4.1"
+    }),
+    HPDRule.SUC_04: MappingProxyType({
+        "description": "Succession notice within 90 days of vacancy",
+        "allowed_exceptions": ("Medical_Hardship", "Incarceration"),
+        "exception_docs": ("Hospital_Records", "Discharge_Summary", "Physician_Letter"),
+        "public_citation": "HPD Succession Procedures §2.3"
+    }),
+    HPDRule.UTI_01: MappingProxyType({
+        "description": "Utility service gaps ≤60 days",
+        "exception_docs": ("Hospital_Records", "Incarceration_Proof", "Travel_Documents"),
+        "public_citation": "HPD Residency Verification §5.4"
+    })
+})
+PUBLIC_CITATIONS = tuple(rule["public_citation"] for rule in _RULES.values())
+
+# Document type recognition patterns
+_DOC_PATTERNS = MappingProxyType({
+    "Schedule_B": ("schedule b", "form 1040 schedule b", "interest dividends"),
+    "FBAR_114": ("fbar", "fin114", "foreign bank account"),
+    "Form_1099K": ("1099-k", "payment card", "third party network"),
+    "Hospital_Records": ("discharge summary", "medical records", "admission date"),
+    "Bank_Statement": ("bank statement", "account statement", "monthly statement")
+})
+
+# Free-text indicators that trigger AST-01 / INC-03, and UTI-01's utility bills
+_FOREIGN_INDICATORS = ("foreign", "overseas", "international", "abroad")
+_GIG_INDICATORS = ("uber", "doordash", "lyft", "grubhub", "instacart", "taskrabbit")
+_UTILITY_INDICATORS = ("utility", "con ed", "coned", "con edison", "electric bill", "gas bill")
+# Matched as whole words only - as bare substrings "Las Vegas" would pass as a gas bill
+_WHOLE_WORD_PATTERNS = frozenset(("con ed", "coned", "con edison", "electric bill", "gas bill"))
+_INDICATOR_PATTERNS = MappingProxyType({
+    "Foreign_Indicator": _FOREIGN_INDICATORS,
+    "Gig_Indicator": _GIG_INDICATORS,
+    "Utility_Bill": _UTILITY_INDICATORS
+})
+
+def _compile_patterns():
+    """
+    One bit per pattern key; every pattern compiled into a single automaton
+    (automaton value: pattern length, substring bits, whole-word-only bits)
+    """
+    pattern_bits = {}
+    bit_patterns = []
+    for key, patterns in {**_DOC_PATTERNS, **_INDICATOR_PATTERNS}.items():
+        bit = 1 << len(pattern_bits)
+        pattern_bits[key] = bit
+        bit_patterns.extend((pattern, bit, pattern in _WHOLE_WORD_PATTERNS) for pattern in patterns)
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pattern, bit, whole_word in bit_patterns:
+            _, bits, word_bits = automaton.get(pattern, (len(pattern), 0, 0))
+            if whole_word:
+                word_bits |= bit
+            else:
+                bits |= bit
+            automaton.add_word(pattern, (len(pattern), bits, word_bits))
+        automaton.make_automaton()
+    return MappingProxyType(pattern_bits), tuple(bit_patterns), automaton
+
+_PATTERN_BITS, _BIT_PATTERNS, _AUTOMATON = _compile_patterns()
+
+# ==================== HOT-PATH HELPERS ====================
+# Module functions (not methods) so hot loops resolve them as globals / locals
+def _scan_doc_type(doc_type: str, mask_cache: "OrderedDict[str, int]") -> int:
+    """
+    Bitmask of every pattern key found in doc_type
+    (one automaton pass per distinct doc_type, then kept in the mask_cache LRU)
+    """
+    mask = mask_cache.get(doc_type)
+    if mask is not None:
+        mask_cache.move_to_end(doc_type)
+    else:
+        doc_text = doc_type.lower()
+        mask = 0
+        if _AUTOMATON is not None:
+            for end, (length, bits, word_bits) in _AUTOMATON.iter(doc_text):
+                mask |= bits
+                if word_bits and _is_whole_word(doc_text, end + 1 - length, end + 1):
+                    mask |= word_bits
+        else:
+            for pattern, bit, whole_word in _BIT_PATTERNS:
+                if _find_whole_word(doc_text, pattern) if whole_word else pattern in doc_text:
+                    mask |= bit
+        mask_cache[doc_type] = mask
+        if len(mask_cache) > MASK_CACHE_SIZE:
+            mask_cache.popitem(last=False)
+    return mask
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """text[start:end] is not glued to a letter or digit on either side"""
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+def _find_whole_word(text: str, pattern: str) -> bool:
+    """Whole-word substring search (fallback when ahocorasick is missing)"""
+    start = text.find(pattern)
+    while start != -1:
+        if _is_whole_word(text, start, start + len(pattern)):
+            return True
+        start = text.find(pattern, start + 1)
+    return False
+
+def _scan_all(documents: List[Document], mask_cache: "OrderedDict[str, int]") -> Signals:
+    """
+    Fused pass over the documents: every rule signal from one scan per doc
+    (instead of each check re-walking and re-lowercasing the list)
+    """
+    scan = _scan_doc_type
+    bits = _PATTERN_BITS
+    utility_bit = bits["Utility_Bill"]
+    mask = 0
+    utility_count = 0
+    for doc in documents:
+        doc_mask = scan(doc.doc_type, mask_cache)
+        mask |= doc_mask
+        if doc_mask & utility_bit:
+            utility_count += 1
+    return Signals(
+        has_schedule_b=bool(mask & bits["Schedule_B"]),
+        has_fbar=bool(mask & bits["FBAR_114"]),
+        has_1099k=bool(mask & bits["Form_1099K"]),
+        has_hospital=bool(mask & bits["Hospital_Records"]),
+        has_foreign=bool(mask & bits["Foreign_Indicator"]),
+        has_gig=bool(mask & bits["Gig_Indicator"]),
+        utility_count=utility_count
+    )
+
 class HPDComplianceVerifier:
     """
     AI-Enhanced Verification Engine
@@ -76,64 +255,60 @@ class HPDComplianceVerifier:
     """
     
     def __init__(self):
-        # PUBLIC HPD rules database - from published guidelines
-        self.rules = {
-            HPDRule.AST_01: {
-                "description": "Foreign financial accounts >$10k must be declared",
-                "required_docs": ["Schedule_B", "FBAR_114", "Bank_Statement"],
-                "threshold": 10000,
-                "public_citation": "HPD Asset Declaration Guidelines §3.2"
-            },
-            HPDRule.INC_03: {
-                "description": "Gig economy income requires 1099-K + platform verification",
-                "required_docs": ["Form_1099K", "Platform_Screenshots", "Bank_Deposits"],
-                "threshold": 600,  # IRS 1099-K threshold
-                "public_citation": "HPD Income Verification Protocol §4.1"
-            },
-            HPDRule.SUC_04: {
-                "description": "Succession notice within 90 days of vacancy",
-                "allowed_exceptions": ["Medical_Hardship", "Incarceration"],
-                "exception_docs": ["Hospital_Records", "Discharge_Summary", "Physician_Letter"],
-                "public_citation": "HPD Succession Procedures §2.3"
-            },
-            HPDRule.UTI_01: {
-                "description": "Utility service gaps ≤60 days",
-                "exception_docs": ["Hospital_Records", "Incarceration_Proof", "Travel_Documents"],
-                "public_citation": "HPD Residency Verification §5.4"
-            }
-        }
-        
-        # Document type recognition patterns
-        self.doc_patterns = {
-            "Schedule_B": ["schedule b", "form 1040 schedule b", "interest dividends"],
-            "FBAR_114": ["fbar", "fin114", "foreign bank account"],
-            "Form_1099K": ["1099-k", "payment card", "third party network"],
-            "Hospital_Records": ["discharge summary", "medical records", "admission date"],
-            "Bank_Statement": ["bank statement", "account statement", "monthly statement"]
-        }
+        # Shared, read-only reference data - nothing rebuilt per verifier
+        self.rules = _RULES
+        self.doc_patterns = _DOC_PATTERNS
+        self._mask_cache = OrderedDict()  # LRU of doc_type masks, at most MASK_CACHE_SIZE
     
-    def verify_case(self, case: SuccessionCase) -> Dict:
+    def verify_case(self, case: SuccessionCase, now: Optional[datetime] = None) -> Dict:
         """
         Verify case against PUBLISHED HPD rules
         Returns compliance report with gaps and fixes
         """
-        report = {
+        now = now or datetime.now()
+        return {
             "case_id": case.case_id,
-            "verification_date": datetime.now().isoformat(),
-            "compliance_score": 0.0,
+            "verification_date": now.isoformat(),
+            **self._evaluate_rules(case)
+        }
+    
+    def verify_cases(self, cases: List[SuccessionCase], now: Optional[datetime] = None) -> List[Dict]:
+        """Batch verification for audit runs - one timestamp for the whole batch"""
+        verification_date = (now or datetime.now()).isoformat()
+        evaluate = self._evaluate_rules
+        return [
+            {"case_id": case.case_id, "verification_date": verification_date, **evaluate(case)}
+            for case in cases
+        ]
+    
+    def _evaluate_rules(self, case: SuccessionCase) -> Dict:
+        """Run all rule checks - the case-independent part of the report"""
+        signals = _scan_all(case.documents, self._mask_cache)
+        
+        # Check each rule
+        ast01_check = self._check_foreign_accounts(signals)
+        inc03_check = self._check_gig_income(signals)
+        suc04_check = self._check_notice_timing(case, signals)
+        uti01_check = self._check_utility_gaps(signals)
+        
+        report = {
+            "compliance_score": 100.0,
             "rule_violations": [],
             "missing_documents": [],
             "recommended_actions": [],
-            "legal_disclaimer": "Verification against published HPD rules only. Not a guarantee of approval.",
-            "public_citations": []
+            "legal_disclaimer": LEGAL_DISCLAIMER,
+            "public_citations": list(PUBLIC_CITATIONS)
         }
         
-        # Check each rule
+        # Common happy path: nothing to report
+        if (ast01_check["compliant"] and inc03_check["compliant"]
+                and suc04_check["compliant"] and uti01_check["compliant"]):
+            return report
+        
         violations = 0
         total_rules = len(self.rules)
         
         # Rule 1: AST-01 - Foreign Accounts
-        ast01_check = self._check_foreign_accounts(case)
         if not ast01_check["compliant"]:
             violations += 1
             report["rule_violations"].append({
@@ -145,7 +320,6 @@ class HPDComplianceVerifier:
             report["recommended_actions"].append(ast01_check["fix"])
         
         # Rule 2: INC-03 - Gig Income
-        inc03_check = self._check_gig_income(case)
         if not inc03_check["compliant"]:
             violations += 1
             report["rule_violations"].append({
@@ -157,7 +331,6 @@ class HPDComplianceVerifier:
             report["recommended_actions"].append(inc03_check["fix"])
         
         # Rule 3: SUC-04 - Notice Timing
-        suc04_check = self._check_notice_timing(case)
         if not suc04_check["compliant"]:
             violations += 1
             report["rule_violations"].append({
@@ -170,7 +343,6 @@ class HPDComplianceVerifier:
                 report["missing_documents"].extend(suc04_check["missing_docs"])
         
         # Rule 4: UTI-01 - Utility Gaps
-        uti01_check = self._check_utility_gaps(case)
         if not uti01_check["compliant"]:
             violations += 1
             report["rule_violations"].append({
@@ -183,26 +355,11 @@ class HPDComplianceVerifier:
         # Calculate compliance score
         report["compliance_score"] = round((total_rules - violations) / total_rules * 100, 1)
         
-        # Add public citations
-        for rule in self.rules.values():
-            report["public_citations"].append(rule["public_citation"])
-        
         return report
     
-    def _check_foreign_accounts(self, case: SuccessionCase) -> Dict:
+    def _check_foreign_accounts(self, signals: Signals) -> Dict:
         """Check AST-01 compliance"""
-        has_schedule_b = any(self._doc_matches(doc, "Schedule_B") for doc in case.documents)
-        has_fbar = any(self._doc_matches(doc, "FBAR_114") for doc in case.documents)
-        has_bank_statement = any(self._doc_matches(doc, "Bank_Statement") for doc in case.documents)
-        
-        # Check for foreign account indicators
-        foreign_indicators = ["foreign", "overseas", "international", "abroad"]
-        has_foreign_mention = any(
-            any(indicator in doc.doc_type.lower() for indicator in foreign_indicators)
-            for doc in case.documents
-        )
-        
-        if has_foreign_mention and not (has_schedule_b and has_fbar):
+        if signals.has_foreign and not (signals.has_schedule_b and signals.has_fbar):
             return {
                 "compliant": False,
                 "issue": "Foreign accounts indicated but missing Schedule B and/or FBAR",
@@ -212,18 +369,9 @@ class HPDComplianceVerifier:
         
         return {"compliant": True}
     
-    def _check_gig_income(self, case: SuccessionCase) -> Dict:
+    def _check_gig_income(self, signals: Signals) -> Dict:
         """Check INC-03 compliance"""
-        has_1099k = any(self._doc_matches(doc, "Form_1099K") for doc in case.documents)
-        
-        # Check for gig platform indicators
-        gig_indicators = ["uber", "doordash", "lyft", "grubhub", "instacart", "taskrabbit"]
-        has_gig_mention = any(
-            any(indicator in doc.doc_type.lower() for indicator in gig_indicators)
-            for doc in case.documents
-        )
-        
-        if has_gig_mention and not has_1099k:
+        if signals.has_gig and not signals.has_1099k:
             return {
                 "compliant": False,
                 "issue": "Gig income indicated but missing 1099-K",
@@ -233,7 +381,7 @@ class HPDComplianceVerifier:
         
         return {"compliant": True}
     
-    def _check_notice_timing(self, case: SuccessionCase) -> Dict:
+    def _check_notice_timing(self, case: SuccessionCase, signals: Signals) -> Dict:
         """Check SUC-04 compliance"""
         days_since_vacancy = case.get_days_since_vacancy()
         
@@ -244,30 +392,24 @@ class HPDComplianceVerifier:
                 "fix": "Provide certified death certificate or vacancy notice with dates"
             }
         
-        if days_since_vacancy <= 90:
+        if days_since_vacancy <= NOTICE_DEADLINE_DAYS:
             return {"compliant": True}
         
         # Check for hardship documentation if late
-        has_hardship_docs = any(
-            self._doc_matches(doc, "Hospital_Records") for doc in case.documents
-        )
-        
-        if days_since_vacancy > 90 and not has_hardship_docs:
+        if not signals.has_hospital:
             return {
                 "compliant": False,
-                "issue": f"Notice filed {days_since_vacancy} days after vacancy (>90 day limit)",
+                "issue": f"Notice filed {days_since_vacancy} days after vacancy (>{NOTICE_DEADLINE_DAYS} day limit)",
                 "missing_docs": ["Hospital discharge papers", "Physician hardship letter"],
-                "fix": f"1. Obtain hospital records covering {days_since_vacancy - 90} days\n2. Cite HPD Protocol §4.2 for medical hardship\n3. Calculate excused days: Hospitalization = {days_since_vacancy - 90} excused days"
+                "fix": f"1. Obtain hospital records covering {days_since_vacancy - NOTICE_DEADLINE_DAYS} days\n2. Cite HPD Protocol §4.2 for medical hardship\n3. Calculate excused days: Hospitalization = {days_since_vacancy - NOTICE_DEADLINE_DAYS} excused days"
             }
         
         return {"compliant": True}
     
-    def _check_utility_gaps(self, case: SuccessionCase) -> Dict:
+    def _check_utility_gaps(self, signals: Signals) -> Dict:
         """Check UTI-01 compliance"""
         # Simplified check - in reality would parse utility statements
-        utility_docs = [d for d in case.documents if "utility" in d.doc_type.lower()]
-        
-        if len(utility_docs) < 12:  # Less than 12 months of utility records
+        if signals.utility_count < MIN_UTILITY_RECORDS:  # Less than 12 months of utility records
             return {
                 "compliant": False,
                 "issue": "Insufficient utility documentation",
@@ -275,31 +417,61 @@ class HPDComplianceVerifier:
             }
         
         return {"compliant": True}
-    
-    def _doc_matches(self, doc: Document, pattern_key: str) -> bool:
-        """Check if document matches a pattern"""
-        if pattern_key not in self.doc_patterns:
-            return False
-        
-        doc_text = doc.doc_type.lower()
-        return any(pattern in doc_text for pattern in self.doc_patterns[pattern_key])
 
 # ==================== DOCUMENT ASSEMBLY ENGINE ====================
+# Category keywords, checked IN ORDER - the first category with any keyword wins
+_CATEGORY_WORDS = (
+    ("Utility Records", ("utility", "con ed", "electric", "gas")),
+    ("Asset Declaration", ("bank", "account", "asset", "schedule")),
+    ("Income Verification", ("income", "1099", "w2", "paystub")),
+    ("Residency Proof", ("lease", "id", "license", "passport")),
+    ("Hardship Documentation", ("medical", "hospital", "doctor", "discharge"))
+)
+
+# One anchored regex: each branch is a lookahead over the whole string, so branch
+# order (not match position) decides, exactly like the old if/elif chain
+_CATEGORY_RE = re.compile(
+    "(?s)^(?:" + "|".join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, words))}))(?P<c{i}>)"
+        for i, (_, words) in enumerate(_CATEGORY_WORDS)
+    ) + ")"
+)
+
+def _categorize_doc_type(doc_type: str) -> str:
+    """Categorize document type"""
+    match = _CATEGORY_RE.match(doc_type.lower())
+    if match:
+        return _CATEGORY_WORDS[int(match.lastgroup[1:])][0]
+    return "Legal Documents"
+
 class DocumentAssembler:
     """
     Creates HPD-ready packages
     Focus: Organization, not content creation
     """
     
-    def create_submission_package(self, case: SuccessionCase, report: Dict) -> Dict:
+    # Package section order; _CAT_INDEX maps a category to its slot
+    _CATEGORIES = (
+        "Residency Proof",
+        "Income Verification",
+        "Asset Declaration",
+        "Hardship Documentation",
+        "Utility Records",
+        "Legal Documents"
+    )
+    _CAT_INDEX = {category: i for i, category in enumerate(_CATEGORIES)}
+    
+    def create_submission_package(self, case: SuccessionCase, report: Dict,
+                                  now: Optional[datetime] = None) -> Dict:
         """Organize documents into HPD submission format"""
+        now = now or datetime.now()
         package = {
-            "package_id": f"HPD_{case.case_id}_{datetime.now().strftime('%Y%m%d')}",
-            "created_date": datetime.now().isoformat(),
+            "package_id": f"HPD_{case.case_id}_{now.strftime('%Y%m%d')}",
+            "created_date": now.isoformat(),
             "case_id": case.case_id,
             "building_id": case.building_id,
             "contents": {
-                "cover_sheet": self._generate_cover_sheet(case, report),
+                "cover_sheet": self._generate_cover_sheet(case, report, now),
                 "table_of_contents": self._generate_toc(case.documents),
                 "documents_by_category": self._categorize_documents(case.documents),
                 "compliance_report": report,
@@ -315,20 +487,21 @@ class DocumentAssembler:
         
         return package
     
-    def _generate_cover_sheet(self, case: SuccessionCase, report: Dict) -> str:
+    def _generate_cover_sheet(self, case: SuccessionCase, report: Dict, now: Optional[datetime] = None) -> str:
         """Generate neutral cover sheet"""
+        now_date = (now or datetime.now()).strftime('%Y-%m-%d')
         cover = f"""
         HPD SUCCESSION VERIFICATION PACKAGE
         ===================================
         
         Case ID: {case.case_id}
         Building BBL: {case.building_id}
-        Submission Date: {datetime.now().strftime('%Y-%m-%d')}
+        Submission Date: {now_date}
         
         VERIFICATION SUMMARY
         -------------------
         Compliance Score: {report['compliance_score']}%
-        Rules Checked: {len([v for v in report['rule_violations']])} violations identified
+        Rules Checked: {len(report['rule_violations'])} violations identified
         
         DOCUMENT INDEX
         --------------
@@ -342,61 +515,53 @@ class DocumentAssembler:
         It does NOT constitute legal advice.
         
         Prepared by: [Your Verification Service Name]
-        Verification Date: {datetime.now().strftime('%Y-%m-%d')}
+        Verification Date: {now_date}
         """
         return cover
     
     def _generate_toc(self, documents: List[Document]) -> List[Dict]:
         """Generate table of contents"""
-        toc = []
-        for i, doc in enumerate(documents, 1):
-            toc.append({
-                "item": i,
-                "bates_number": f"HPD-{i:04d}",
-                "description": doc.doc_type,
-                "date": doc.upload_date.strftime('%Y-%m-%d'),
-                "source": doc.source,
-                "category": self._categorize_doc_type(doc.doc_type)
-            })
-        return toc
+        n = len(documents)
+        # Column-wise: date.isoformat() is the C fast path for '%Y-%m-%d'
+        bates = [f"HPD-{i:04d}" for i in range(1, n + 1)]
+        dates = [doc.upload_date.date().isoformat() for doc in documents]
+        categorize = _categorize_doc_type
+        categories = [categorize(doc.doc_type) for doc in documents]
+        return [
+            {
+                "item": i + 1,
+                "bates_number": bates[i],
+                "description": documents[i].doc_type,
+                "date": dates[i],
+                "source": documents[i].source,
+                "category": categories[i]
+            }
+            for i in range(n)
+        ]
     
     def _categorize_documents(self, documents: List[Document]) -> Dict:
         """Categorize documents for HPD review"""
-        categories = {
-            "Residency Proof": [],
-            "Income Verification": [],
-            "Asset Declaration": [],
-            "Hardship Documentation": [],
-            "Utility Records": [],
-            "Legal Documents": []
-        }
-        
-        for doc in documents:
-            category = self._categorize_doc_type(doc.doc_type)
-            categories[category].append({
-                "type": doc.doc_type,
-                "date": doc.upload_date.strftime('%Y-%m-%d'),
-                "source": doc.source
-            })
+        # One category index per doc, then a stable sort groups them without per-category appends
+        categorize, cat_index = _categorize_doc_type, self._CAT_INDEX
+        cat_idx = np.fromiter(
+            (cat_index[categorize(doc.doc_type)] for doc in documents),
+            dtype=np.int8, count=len(documents)
+        )
+        order = np.argsort(cat_idx, kind='stable')
+        bounds = np.searchsorted(cat_idx[order], np.arange(len(self._CATEGORIES) + 1)).tolist()
+        order = order.tolist()
         
-        return categories
-    
-    def _categorize_doc_type(self, doc_type: str) -> str:
-        """Categorize document type"""
-        doc_type_lower = doc_type.lower()
-        
-        if any(word in doc_type_lower for word in ["utility", "con ed", "electric", "gas"]):
-            return "Utility Records"
-        elif any(word in doc_type_lower for word in ["bank", "account", "asset", "schedule"]):
-            return "Asset Declaration"
-        elif any(word in doc_type_lower for word in ["income", "1099", "w2", "paystub"]):
-            return "Income Verification"
-        elif any(word in doc_type_lower for word in ["lease", "id", "license", "passport"]):
-            return "Residency Proof"
-        elif any(word in doc_type_lower for word in ["medical", "hospital", "doctor", "discharge"]):
-            return "Hardship Documentation"
-        else:
-            return "Legal Documents"
+        return {
+            category: [
+                {
+                    "type": documents[i].doc_type,
+                    "date": documents[i].upload_date.date().isoformat(),
+                    "source": documents[i].source
+                }
+                for i in order[bounds[c]:bounds[c + 1]]
+            ]
+            for c, category in enumerate(self._CATEGORIES)
+        }
     
     def _generate_verification_cert(self, report: Dict) -> str:
         """Generate verification certificate"""
@@ -439,43 +604,50 @@ class SecureClientPortal:
     """
     
     def __init__(self):
-        self.active_sessions = {}
+        # Bounded + expiring: oldest sessions evicted first, expired ones dropped on access
+        self.active_sessions = OrderedDict()
+        self._session_deadlines = {}
+        self._sessions_lock = threading.RLock()
         self.encryption_key = self._generate_session_key()
     
     def create_client_session(self, client_id: str, case_data: Dict) -> Dict:
         """Create secure session for client document upload"""
-        session_id = hashlib.sha256(f"{client_id}{datetime.now().isoformat()}".encode()).hexdigest()[:16]
+        now = datetime.now()
+        # Random, not derived from client_id/time - unguessable and collision-free within a microsecond
+        session_id = secrets.token_hex(8)
         
         session = {
             "session_id": session_id,
             "client_id": client_id,
-            "created": datetime.now().isoformat(),
-            "expires": (datetime.now() + timedelta(hours=24)).isoformat(),
+            "created": now.isoformat(),
+            "expires": (now + timedelta(seconds=SESSION_TTL_SECONDS)).isoformat(),
             "upload_url": f"https://secure-upload.example.com/{session_id}",
             "instructions": self._get_upload_instructions(),
             "data_retention": "Files auto-deleted after 30 days",
             "encryption": "AES-256 in transit and at rest"
         }
         
-        self.active_sessions[session_id] = session
+        self._store_session(session_id, session)
         return session
     
     def process_upload(self, session_id: str, files: List) -> Dict:
         """Process uploaded files - ANONYMIZED"""
-        if session_id not in self.active_sessions:
+        if self._get_session(session_id) is None:
             return {"error": "Invalid session"}
         
         processed_files = []
+        uploaded = datetime.now()
         for file in files:
+            content_hash, size = self._hash_content(file.get("content", b""))
             # Anonymize processing
             doc = Document(
                 doc_type=file.get("type", "Unknown"),
-                content_hash=hashlib.sha256(file.get("content", b"").encode()).hexdigest(),
-                upload_date=datetime.now(),
+                content_hash=content_hash,
+                upload_date=uploaded,
                 source="Client Upload",
                 metadata={
                     "original_filename": "[REDACTED]",
-                    "size_kb": len(file.get("content", "")) / 1024,
+                    "size_kb": size / 1024,
                     "mime_type": file.get("mime_type", "application/octet-stream")
                 }
             )
@@ -488,9 +660,72 @@ class SecureClientPortal:
             "documents": [{"type": d.doc_type, "hash": d.content_hash[:8]} for d in processed_files]
         }
     
+    def _store_session(self, session_id: str, session: Dict) -> None:
+        """Add a session, purging expired ones and evicting the oldest past MAX_ACTIVE_SESSIONS"""
+        with self._sessions_lock:
+            self._purge_expired_sessions()
+            self.active_sessions[session_id] = session
+            self._session_deadlines[session_id] = time.monotonic() + SESSION_TTL_SECONDS
+            while len(self.active_sessions) > MAX_ACTIVE_SESSIONS:
+                oldest, _ = self.active_sessions.popitem(last=False)
+                del self._session_deadlines[oldest]
+    
+    def _get_session(self, session_id: str) -> Optional[Dict]:
+        """Session if it exists and has not expired - None on miss or expiry"""
+        with self._sessions_lock:
+            deadline = self._session_deadlines.get(session_id)
+            if deadline is None:
+                return None
+            if deadline <= time.monotonic():
+                del self.active_sessions[session_id]
+                del self._session_deadlines[session_id]
+                return None
+            return self.active_sessions[session_id]
+    
+    def _purge_expired_sessions(self) -> None:
+        """
+        Drop expired sessions from the front
+        (every session gets the same TTL, so creation order is expiry order)
+        """
+        now = time.monotonic()
+        while self.active_sessions:
+            oldest = next(iter(self.active_sessions))
+            if self._session_deadlines[oldest] > now:
+                break
+            del self.active_sessions[oldest]
+            del self._session_deadlines[oldest]
+    
+    @staticmethod
+    def _hash_content(content) -> Tuple[str, int]:
+        """
+        SHA-256 hex digest + byte size of an upload
+        Accepts str, bytes-like, or a binary / text file object (streamed in chunks, never fully loaded)
+        """
+        digest = hashlib.sha256()
+        if isinstance(content, io.TextIOBase):
+            # Text mode: hash the UTF-8 bytes, same as passing the whole str
+            size = 0
+            while chunk := content.read(UPLOAD_CHUNK_BYTES):
+                data = chunk.encode()
+                digest.update(data)
+                size += len(data)
+            return digest.hexdigest(), size
+        if hasattr(content, "readinto"):
+            buf = bytearray(UPLOAD_CHUNK_BYTES)
+            view = memoryview(buf)
+            size = 0
+            while n := content.readinto(buf):
+                digest.update(view[:n])
+                size += n
+            return digest.hexdigest(), size
+        if isinstance(content, str):
+            content = content.encode()
+        digest.update(content)
+        return digest.hexdigest(), len(content)
+    
     def _generate_session_key(self) -> str:
         """Generate session key"""
-        return hashlib.sha256(datetime.now().isoformat().encode()).hexdigest()[:32]
+        return secrets.token_hex(16)
     
     def _get_upload_instructions(self) -> List[str]:
         """Get upload instructions"""
@@ -504,7 +739,7 @@ class SecureClientPortal:
     
     def _generate_case_id(self) -> str:
         """Generate anonymized case ID"""
-        return f"CASE_{hashlib.sha256(datetime.now().isoformat().encode()).hexdigest()[:8].upper()}"
+        return f"CASE_{secrets.token_hex(4).upper()}"
 
 # ==================== MAIN EXECUTION ====================
 def main():
@@ -534,26 +769,27 @@ def main():
     print(f"Upload URL: {client_session['upload_url']}")
     print(f"Data retention: {client_session['data_retention']}")
     
-    # Simulate uploaded documents
+    # Simulate uploaded documents (one clock reading for the whole demo run)
+    now = datetime.now()
     sample_docs = [
         Document(
             doc_type="Hospital Discharge Summary",
             content_hash="a1b2c3d4e5f6",
-            upload_date=datetime.now() - timedelta(days=10),
+            upload_date=now - timedelta(days=10),
             source="Mount Sinai Hospital",
             metadata={"form_number": "H-88"}
         ),
         Document(
             doc_type="Bank Statement Foreign",
             content_hash="b2c3d4e5f6g7",
-            upload_date=datetime.now() - timedelta(days=30),
+            upload_date=now - timedelta(days=30),
             source="Swiss Bank AG",
             metadata={"currency": "CHF", "amount": "15000"}
         ),
         Document(
             doc_type="DoorDash Earnings Summary",
             content_hash="c3d4e5f6g7h8",
-            upload_date=datetime.now() - timedelta(days=45),
+            upload_date=now - timedelta(days=45),
             source="DoorDash Platform",
             metadata={"period": "Q4 2024", "earnings": "8500"}
         )
@@ -564,15 +800,15 @@ def main():
         case_id="TEST_001",
         building_id="3002920026",  # Sample BBL
         documents=sample_docs,
-        vacancy_date=datetime.now() - timedelta(days=120),
-        submission_date=datetime.now() - timedelta(days=15)
+        vacancy_date=now - timedelta(days=120),
+        submission_date=now - timedelta(days=15)
     )
     
     # Run verification
     print("\n2. HPD COMPLIANCE VERIFICATION")
     print("-" * 40)
     
-    report = verifier.verify_case(test_case)
+    report = verifier.verify_case(test_case, now=now)
     
     print(f"Compliance Score: {report['compliance_score']}%")
     print(f"Rules Violated: {len(report['rule_violations'])}")
@@ -585,7 +821,7 @@ def main():
     print("\n3. DOCUMENT ASSEMBLY")
     print("-" * 40)
     
-    package = assembler.create_submission_package(test_case, report)
+    package = assembler.create_submission_package(test_case, report, now=now)
     
     print(f"Package ID: {package['package_id']}")
     print(f"Documents: {len(test_case.documents)} organized into {len(package['contents']['documents_by_category'])} categories")
@@ -618,8 +854,12 @@ if __name__ == "__main__":
     results = main()
     
     # Export results
-    with open("hpd_verification_report.json", "w") as f:
-        json.dump(results, f, indent=2, default=str)
+    if orjson is not None:
+        with open("hpd_verification_report.json", "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open("hpd_verification_report.json", "w") as f:
+            json.dump(results, f, indent=2, default=str)
     
     print("\n✅ Verification complete. Report saved to hpd_verification_report.json")
     print("\n🎯 NEXT STEPS:")